@@ -3,27 +3,34 @@ Blackjack Client Application.
 Listens for server offers via UDP and plays games via TCP.
 """
 
+import queue
+import selectors
 import socket
 import sys
+import threading
 import time
-from typing import List, Tuple, Optional
+from typing import Iterator, List, Tuple, Optional
 
 from config import (
-    UDP_BROADCAST_PORT, CLIENT_NAME, SOCKET_TIMEOUT,
+    UDP_BROADCAST_PORT, CLIENT_NAME, SOCKET_TIMEOUT, TCP_RECV_BUFFER_SIZE,
+    OFFER_BATCH_SIZE, OFFER_POLL_INTERVAL, ROUND_DELAY, UDP_SOCKET_BUFFER_SIZE,
+    USE_MULTICAST, MULTICAST_GROUP,
     RESULT_ONGOING, RESULT_WIN, RESULT_LOSS, RESULT_TIE,
     SERVER_PAYLOAD_SIZE
 )
 from protocol import (
-    unpack_offer, pack_request, pack_client_payload, unpack_server_payload
+    unpack_offer, pack_request, pack_client_payload, unpack_server_payload_from
 )
 from game_logic import (
-    Card, card_value, format_card, 
-    calculate_odds_if_hit, calculate_odds_if_stand, get_recommendation
+    Card, CARD_VALUES, format_card, 
+    calculate_odds_if_hit, calculate_odds_if_stand, recommend_from_odds
 )
 from utils import (
     log_info, log_success, log_warning, log_error,
-    display_client_started, display_welcome, display_game_state, display_result,
-    colored, Colors, bold, draw_box, format_card_colored
+    display_client_started, display_welcome, display_game_state,
+    display_game_state_minimal, display_result,
+    colored, Colors, bold, draw_box, CARD_STRINGS_COLORED,
+    set_socket_buffer, join_multicast_group
 )
 
 
@@ -77,75 +84,256 @@ class GameStats:
         return f"W:{self.wins} L:{self.losses} T:{self.ties} ({self.win_rate():.1f}%) | {self.points} pts"
 
 
+# =============================================================================
+# PLAYER INPUT
+# =============================================================================
+
+# Accepted answers to the Hit/Stand prompt
+HIT_INPUTS = frozenset({'h', 'hit'})
+STAND_INPUTS = frozenset({'s', 'stand'})
+DECISION_INPUTS = HIT_INPUTS | STAND_INPUTS
+
+
+# =============================================================================
+# DISPLAY CONSTANTS
+# =============================================================================
+
+# Fixed colored strings, built once instead of on every round/prompt
+ROUND_SEPARATOR = colored('=' * 60, Colors.CYAN)
+SUMMARY_SEPARATOR = colored('=' * 50, Colors.GREEN)
+MENU_SEPARATOR = colored('=' * 50, Colors.CYAN)
+
+DECISION_PROMPT = f"  Enter decision ({colored('H', Colors.GREEN)}it / {colored('S', Colors.YELLOW)}tand): "
+INVALID_DECISION_MSG = colored('Invalid input. Please enter H or S.', Colors.RED)
+DREW_LABEL = colored('Drew:', Colors.CYAN)
+BUST_MSG = colored('💥 BUST! You lose this round.', Colors.RED)
+STAND_LABEL = colored('You stand at', Colors.YELLOW)
+DEALER_REVEALS_MSG = colored('Dealer reveals hidden card...', Colors.CYAN)
+
+BONUS_MODE_MSG = colored('🎰 BONUS MODE: Playing without statistics!', Colors.YELLOW)
+BONUS_POINTS_MSG = colored(f'   Wins award {POINTS_WIN_NO_STATS} points (2x bonus!)', Colors.GREEN)
+BONUS_EARNED_LABEL = colored('🎰 BONUS POINTS EARNED:', Colors.YELLOW)
+ROUNDS_RANGE_MSG = colored('Please enter a number between 1 and 255.', Colors.RED)
+ROUNDS_INVALID_MSG = colored('Please enter a valid number.', Colors.RED)
+
+MENU_TITLE = colored('What would you like to do?', Colors.BOLD)
+MENU_OPTION_1 = colored('1', Colors.GREEN)
+MENU_OPTION_2 = colored('2', Colors.YELLOW)
+MENU_OPTION_3 = colored('3', Colors.RED)
+NEXT_ACTION_PROMPT = f"  Enter your choice ({MENU_OPTION_1}/{MENU_OPTION_2}/{MENU_OPTION_3}): "
+NEXT_ACTION_MENU = "\n".join([
+    "",
+    MENU_SEPARATOR,
+    f"  {MENU_TITLE}",
+    f"  {MENU_OPTION_1} - Play again",
+    f"  {MENU_OPTION_2} - Back to main menu",
+    f"  {MENU_OPTION_3} - Exit",
+    MENU_SEPARATOR,
+    "",
+])
+GOODBYE_MSG = colored('Goodbye!', Colors.GREEN)
+THANKS_MSG = colored('Thanks for playing! Goodbye! 🎰', Colors.GREEN)
+
+SUBMIT_PROMPT = f"  Submit results to leaderboard? ({colored('Y', Colors.GREEN)}/{colored('N', Colors.RED)}): "
+NO_NAME_MSG = colored('No name entered, skipping submission.', Colors.YELLOW)
+SUBMITTING_MSG = colored('Submitting results in the background...', Colors.DIM)
+SUBMIT_OK_MSG = colored('✅ Results submitted successfully!', Colors.GREEN)
+LEADERBOARD_UNAVAILABLE_MSG = colored('Leaderboard server is not available.', Colors.YELLOW)
+SUBMIT_FAILED_MSG = colored('Failed to submit results.', Colors.RED)
+
+
 # =============================================================================
 # HELPER FUNCTIONS  
 # =============================================================================
 
-def recv_exact(sock: socket.socket, num_bytes: int) -> bytes:
+class RecvBuffer:
+    """
+    Persistent per-connection receive buffer.
+    The server often sends several payloads back-to-back (e.g. the dealer's
+    draws), so each recv drains as much as is available and later reads are
+    served from memory.
     """
-    Receive exactly num_bytes from socket.
-    TCP may deliver data in chunks, so we need to loop until we have all bytes.
     
-    Args:
-        sock: Socket to receive from
-        num_bytes: Exact number of bytes to receive
+    def __init__(self, sock: socket.socket, capacity: int = TCP_RECV_BUFFER_SIZE):
+        """
+        Create a receive buffer for a connected socket.
         
-    Returns:
-        bytes: Exactly num_bytes of data, or empty bytes if connection closed
-    """
-    data = b''
-    while len(data) < num_bytes:
-        chunk = sock.recv(num_bytes - len(data))
-        if not chunk:
-            return b''  # Connection closed
-        data += chunk
-    return data
+        Args:
+            sock: Connected TCP socket
+            capacity: Maximum number of bytes pulled in by a single recv
+        """
+        self.sock = sock
+        self.buf = bytearray(capacity)
+        self.view = memoryview(self.buf)
+        self.start = 0  # Offset of the first unread byte
+        self.end = 0    # Offset one past the last received byte
+    
+    def read_view(self, num_bytes: int) -> memoryview:
+        """
+        Receive exactly num_bytes and return them as a view into the buffer.
+        TCP may deliver data in chunks, so we loop until we have all bytes.
+        The view is only valid until the next read, so parse it right away.
+        
+        Args:
+            num_bytes: Exact number of bytes to receive
+            
+        Returns:
+            memoryview: Exactly num_bytes of data, or empty if connection closed
+        """
+        if self.end - self.start < num_bytes:
+            # Move the unread tail to the front so the rest of the buffer is free
+            pending = self.end - self.start
+            self.view[:pending] = self.view[self.start:self.end]
+            self.start, self.end = 0, pending
+            
+            while self.end < num_bytes:
+                n = self.sock.recv_into(self.view[self.end:])
+                if not n:
+                    return self.view[:0]  # Connection closed
+                self.end += n
+        
+        data = self.view[self.start:self.start + num_bytes]
+        self.start += num_bytes
+        return data
+    
+    def drain_frames(self, frame_size: int) -> Iterator[memoryview]:
+        """
+        Yield every complete frame already buffered, receiving once if the
+        buffer does not hold a full frame yet.
+        A frame is consumed only when it is yielded, so stopping early leaves
+        the remaining frames buffered for the next read.
+        
+        Args:
+            frame_size: Size of each fixed-length frame
+            
+        Yields:
+            memoryview: One frame at a time (nothing if the connection closed)
+        """
+        if self.end - self.start < frame_size:
+            data = self.read_view(frame_size)
+            if not data:
+                return  # Connection closed
+            yield data
+        
+        while self.end - self.start >= frame_size:
+            data = self.view[self.start:self.start + frame_size]
+            self.start += frame_size
+            yield data
 
 
 # =============================================================================
 # UDP LISTENER
 # =============================================================================
 
-def listen_for_offer() -> Tuple[str, int, str]:
+def recv_datagram_batch(udp_socket: socket.socket,
+                        buffers: List[bytearray]) -> List[Tuple[bytes, tuple]]:
     """
-    Listen for server offer broadcasts.
+    Receive a batch of queued datagrams without blocking.
+    Drains whatever is already queued (up to len(buffers)). Python has no
+    recvmmsg, so this is the closest portable equivalent.
     
+    Args:
+        udp_socket: Bound, non-blocking UDP socket
+        buffers: Preallocated receive buffers, one per datagram
+        
     Returns:
-        Tuple of (server_ip, tcp_port, server_name)
+        List of (data, addr) tuples, empty if nothing was queued
     """
-    log_info(f"Listening for offers on UDP port {UDP_BROADCAST_PORT}...")
+    batch = []
+    for buf in buffers:
+        try:
+            nbytes, addr = udp_socket.recvfrom_into(buf)
+        except (BlockingIOError, InterruptedError):
+            break  # Queue is empty
+        batch.append((bytes(buf[:nbytes]), addr))
     
-    # Create UDP socket
+    return batch
+
+
+def create_offer_socket() -> socket.socket:
+    """
+    Create the UDP socket used to listen for server offers.
+    The client keeps it for its whole lifetime instead of rebinding the
+    offer port for every game session.
+    
+    Returns:
+        socket.socket: Non-blocking UDP socket bound to UDP_BROADCAST_PORT
+    """
     udp_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    # SO_REUSEADDR lets several clients on one host share the offer port and
+    # all receive each broadcast. SO_REUSEPORT is deliberately not set: for
+    # unicast datagrams it load-balances between sockets instead.
     udp_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    # Room for bursts of offers; whatever size the OS grants is fine
+    set_socket_buffer(udp_socket, socket.SO_RCVBUF, UDP_SOCKET_BUFFER_SIZE)
+    
+    udp_socket.bind(('', UDP_BROADCAST_PORT))
+    if USE_MULTICAST:
+        join_multicast_group(udp_socket, MULTICAST_GROUP)
+    # Reads are driven by a selector, so the socket itself never blocks
+    udp_socket.setblocking(False)
+    return udp_socket
+
+
+def discard_queued_datagrams(udp_socket: socket.socket):
+    """
+    Drop datagrams that queued up while the socket was not being read.
+    Offers received during a game may come from servers that are gone.
     
-    # On Windows, SO_REUSEPORT doesn't exist, use SO_REUSEADDR
+    Args:
+        udp_socket: Bound, non-blocking UDP socket
+    """
     try:
-        udp_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
-    except AttributeError:
-        pass  # SO_REUSEPORT not available on Windows
+        while True:
+            udp_socket.recv(1024)
+    except (BlockingIOError, InterruptedError):
+        pass  # Queue is empty
+    except OSError:
+        pass  # e.g. ICMP errors reported on Windows; nothing left worth reading
+
+
+def listen_for_offer(udp_socket: socket.socket) -> Tuple[str, int, str]:
+    """
+    Listen for server offer broadcasts.
     
-    udp_socket.bind(('', UDP_BROADCAST_PORT))
+    Args:
+        udp_socket: Socket from create_offer_socket (left open)
     
-    while True:
-        try:
-            data, addr = udp_socket.recvfrom(1024)
-            server_ip = addr[0]
-            
-            # Parse the offer
-            offer = unpack_offer(data)
-            if offer is None:
+    Returns:
+        Tuple of (server_ip, tcp_port, server_name)
+    """
+    log_info(f"Listening for offers on UDP port {UDP_BROADCAST_PORT}...")
+    
+    discard_queued_datagrams(udp_socket)
+    
+    buffers = [bytearray(1024) for _ in range(OFFER_BATCH_SIZE)]
+    
+    with selectors.DefaultSelector() as selector:
+        selector.register(udp_socket, selectors.EVENT_READ)
+        
+        while True:
+            # Wait with a timeout instead of a blocking recv, so Ctrl+C is
+            # handled promptly on every platform
+            if not selector.select(OFFER_POLL_INTERVAL):
                 continue
             
-            tcp_port, server_name = offer
-            
-            log_success(f"Received offer from {server_ip} - \"{server_name}\"")
-            udp_socket.close()
-            return (server_ip, tcp_port, server_name)
-            
-        except Exception as e:
-            log_warning(f"Error receiving offer: {e}")
-            continue
+            try:
+                for data, addr in recv_datagram_batch(udp_socket, buffers):
+                    server_ip = addr[0]
+                    
+                    # Parse the offer
+                    offer = unpack_offer(data)
+                    if offer is None:
+                        continue
+                    
+                    tcp_port, server_name = offer
+                    
+                    log_success(f"Received offer from {server_ip} - \"{server_name}\"")
+                    return (server_ip, tcp_port, server_name)
+                
+            except Exception as e:
+                log_warning(f"Error receiving offer: {e}")
+                continue
 
 
 # =============================================================================
@@ -154,7 +342,7 @@ def listen_for_offer() -> Tuple[str, int, str]:
 
 def format_cards_display(cards: List[Tuple[int, int]]) -> str:
     """Format a list of cards for display with colors."""
-    return ' '.join(format_card_colored(rank, suit) for rank, suit in cards)
+    return ' '.join([CARD_STRINGS_COLORED[card] for card in cards])
 
 
 def play_game(server_ip: str, tcp_port: int, server_name: str, 
@@ -178,26 +366,36 @@ def play_game(server_ip: str, tcp_port: int, server_name: str,
         tcp_socket.settimeout(SOCKET_TIMEOUT)
         tcp_socket.connect((server_ip, tcp_port))
         
+        # Decisions are tiny request/response writes - send them immediately
+        tcp_socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        
         log_success("Connected!")
         
+        # Buffer reads so several small payloads are served by one recv()
+        rbuf = RecvBuffer(tcp_socket)
+        
         # Send request with number of rounds
         request = pack_request(num_rounds, CLIENT_NAME)
-        tcp_socket.send(request)
+        tcp_socket.sendall(request)
         
         # Play rounds
         for round_num in range(1, num_rounds + 1):
-            print(f"\n{colored('='*60, Colors.CYAN)}")
-            print(f"  📍 Round {round_num}/{num_rounds} vs {server_name}")
-            print(f"{colored('='*60, Colors.CYAN)}\n")
+            sys.stdout.write(
+                f"\n{ROUND_SEPARATOR}\n"
+                f"  📍 Round {round_num}/{num_rounds} vs {server_name}\n"
+                f"{ROUND_SEPARATOR}\n\n"
+            )
+            sys.stdout.flush()
             
-            result = play_round(tcp_socket, stats, show_stats)
+            result = play_round(tcp_socket, rbuf, stats, show_stats)
             
             if result is None:
                 log_error("Connection lost during round")
                 break
             
-            # Small delay between rounds
-            time.sleep(0.5)
+            # Small delay between rounds (skipped when input is scripted)
+            if ROUND_DELAY and sys.stdin.isatty():
+                time.sleep(ROUND_DELAY)
         
         tcp_socket.close()
         
@@ -209,12 +407,14 @@ def play_game(server_ip: str, tcp_port: int, server_name: str,
         log_error(f"Connection error: {e}")
 
 
-def play_round(tcp_socket: socket.socket, stats: GameStats, show_stats: bool = True) -> Optional[int]:
+def play_round(tcp_socket: socket.socket, rbuf: RecvBuffer, stats: GameStats,
+               show_stats: bool = True) -> Optional[int]:
     """
     Play a single round of blackjack.
     
     Args:
         tcp_socket: Connected TCP socket
+        rbuf: Receive buffer wrapping tcp_socket
         stats: GameStats object to update
         show_stats: Whether to show statistics (default True)
         
@@ -223,7 +423,16 @@ def play_round(tcp_socket: socket.socket, stats: GameStats, show_stats: bool = T
     """
     player_cards: List[Tuple[int, int]] = []
     dealer_cards: List[Tuple[int, int]] = []
-    known_cards: List[Tuple[int, int]] = []
+    known_counts = [0] * 14  # Known cards per rank (for the odds calculator)
+    player_total = 0
+    
+    # Bind names used inside the loops to locals (cheaper lookups)
+    read_view = rbuf.read_view
+    drain_frames = rbuf.drain_frames
+    sendall = tcp_socket.sendall
+    unpack = unpack_server_payload_from
+    card_values = CARD_VALUES
+    card_strings = CARD_STRINGS_COLORED
     
     # =========================================================================
     # RECEIVE INITIAL CARDS
@@ -231,11 +440,11 @@ def play_round(tcp_socket: socket.socket, stats: GameStats, show_stats: bool = T
     
     # Receive player's 2 cards
     for i in range(2):
-        data = recv_exact(tcp_socket, SERVER_PAYLOAD_SIZE)
+        data = read_view(SERVER_PAYLOAD_SIZE)
         if not data:
             return None
         
-        payload = unpack_server_payload(data)
+        payload = unpack(data)
         if payload is None:
             log_error("Invalid payload from server")
             continue
@@ -243,73 +452,83 @@ def play_round(tcp_socket: socket.socket, stats: GameStats, show_stats: bool = T
         result, rank, suit = payload
         if rank > 0:  # Valid card
             player_cards.append((rank, suit))
-            known_cards.append((rank, suit))
+            known_counts[rank] += 1
+            player_total += card_values[rank]
     
     # Receive dealer's visible card
-    data = recv_exact(tcp_socket, SERVER_PAYLOAD_SIZE)
+    data = read_view(SERVER_PAYLOAD_SIZE)
     if not data:
         return None
     
-    payload = unpack_server_payload(data)
+    payload = unpack(data)
     if payload:
         result, rank, suit = payload
         if rank > 0:
             dealer_cards.append((rank, suit))
-            known_cards.append((rank, suit))
+            known_counts[rank] += 1
     
-    # Calculate initial totals
-    player_total = sum(card_value(rank) for rank, suit in player_cards)
-    dealer_visible_value = card_value(dealer_cards[0][0]) if dealer_cards else 0
+    # Value of the dealer's visible card
+    dealer_visible_value = card_values[dealer_cards[0][0]] if dealer_cards else 0
     
     # =========================================================================
     # PLAYER'S TURN
     # =========================================================================
     
     while True:
-        # Calculate odds only if showing statistics
+        # Display game state - odds are only calculated when showing statistics
         if show_stats:
-            hit_odds = calculate_odds_if_hit(player_total, dealer_visible_value, known_cards)
-            stand_odds = calculate_odds_if_stand(player_total, dealer_visible_value, known_cards)
-            rec, hit_win, stand_win = get_recommendation(player_total, dealer_visible_value, known_cards)
+            hit_odds = calculate_odds_if_hit(player_total, dealer_visible_value, known_counts)
+            stand_odds = calculate_odds_if_stand(player_total, dealer_visible_value, known_counts)
+            rec, hit_win, stand_win = recommend_from_odds(hit_odds, stand_odds)
+            
+            print(display_game_state(
+                player_cards=format_cards_display(player_cards),
+                player_total=player_total,
+                dealer_cards=format_cards_display(dealer_cards) + " [?]",
+                dealer_visible=dealer_visible_value,
+                odds_hit=hit_odds,
+                odds_stand=stand_odds,
+                recommendation=rec
+            ))
         else:
-            hit_odds = None
-            stand_odds = None
-            rec = None
-        
-        # Display game state (with or without odds based on mode)
-        print(display_game_state(
-            player_cards=format_cards_display(player_cards),
-            player_total=player_total,
-            dealer_cards=format_cards_display(dealer_cards) + " [?]",
-            dealer_visible=dealer_visible_value,
-            odds_hit=hit_odds,
-            odds_stand=stand_odds,
-            recommendation=rec
-        ))
+            print(display_game_state_minimal(
+                player_cards=format_cards_display(player_cards),
+                player_total=player_total,
+                dealer_cards=format_cards_display(dealer_cards) + " [?]"
+            ))
         print()
         
         # Get player decision
         while True:
             try:
-                decision = input(f"  Enter decision ({colored('H', Colors.GREEN)}it / {colored('S', Colors.YELLOW)}tand): ").strip().lower()
-                if decision in ['h', 'hit', 's', 'stand']:
-                    break
-                print(f"  {colored('Invalid input. Please enter H or S.', Colors.RED)}")
+                decision = input(DECISION_PROMPT).strip()
             except EOFError:
-                decision = 's'
+                # No more input - stand
+                hit = False
                 break
+            
+            # Common case is an exact lowercase 'h' or 's'; only lower() otherwise
+            if decision not in DECISION_INPUTS:
+                decision = decision.lower()
+                if decision not in DECISION_INPUTS:
+                    print(f"  {INVALID_DECISION_MSG}")
+                    continue
+            
+            # Every accepted input starts with 'h' (hit) or 's' (stand)
+            hit = decision[0] == 'h'
+            break
         
         # Send decision to server
-        if decision in ['h', 'hit']:
+        if hit:
             payload = pack_client_payload("Hit")
-            tcp_socket.send(payload)
+            sendall(payload)
             
             # Receive new card
-            data = recv_exact(tcp_socket, SERVER_PAYLOAD_SIZE)
+            data = read_view(SERVER_PAYLOAD_SIZE)
             if not data:
                 return None
             
-            response = unpack_server_payload(data)
+            response = unpack(data)
             if response is None:
                 log_error("Invalid response from server")
                 continue
@@ -318,76 +537,83 @@ def play_round(tcp_socket: socket.socket, stats: GameStats, show_stats: bool = T
             
             if rank > 0:
                 player_cards.append((rank, suit))
-                known_cards.append((rank, suit))
-                player_total = sum(card_value(r) for r, s in player_cards)
+                known_counts[rank] += 1
+                player_total += card_values[rank]
                 
-                print(f"\n  {colored('Drew:', Colors.CYAN)} {format_card_colored(rank, suit)} (Total: {player_total})")
+                print(f"\n  {DREW_LABEL} {card_strings[(rank, suit)]} (Total: {player_total})")
             
             # Check for bust
             if result == RESULT_LOSS:
-                print(f"\n  {colored('💥 BUST! You lose this round.', Colors.RED)}")
                 stats.record_loss()
                 
-                print(display_result(
+                sys.stdout.write(f"\n  {BUST_MSG}\n" + display_result(
                     RESULT_LOSS, player_total, 0,
                     stats.wins, stats.losses, stats.ties, show_stats
-                ))
+                ) + "\n")
+                sys.stdout.flush()
                 return RESULT_LOSS
         else:
             # Stand
             payload = pack_client_payload("Stand")
-            tcp_socket.send(payload)
-            print(f"\n  {colored('You stand at', Colors.YELLOW)} {player_total}")
+            sendall(payload)
+            print(f"\n  {STAND_LABEL} {player_total}")
             break
     
     # =========================================================================
     # DEALER'S TURN
     # =========================================================================
     
-    print(f"\n  {colored('Dealer reveals hidden card...', Colors.CYAN)}")
+    print(f"\n  {DEALER_REVEALS_MSG}")
     
     # Receive dealer's hidden card
-    data = recv_exact(tcp_socket, SERVER_PAYLOAD_SIZE)
+    data = read_view(SERVER_PAYLOAD_SIZE)
     if not data:
         return None
     
-    response = unpack_server_payload(data)
+    dealer_total = dealer_visible_value
+    
+    response = unpack(data)
     if response and response[1] > 0:
         result, rank, suit = response
         dealer_cards.append((rank, suit))
+        dealer_total += card_values[rank]
         print(f"  Dealer has: {format_cards_display(dealer_cards)}")
     
-    dealer_total = sum(card_value(r) for r, s in dealer_cards)
     print(f"  Dealer total: {dealer_total}")
     
-    # Receive any additional dealer cards until result
-    while True:
-        data = recv_exact(tcp_socket, SERVER_PAYLOAD_SIZE)
-        if not data:
-            return None
+    # Receive any additional dealer cards until result. The server sends them
+    # back-to-back, so each batch is decoded from memory between recvs.
+    round_over = False
+    while not round_over:
+        received = False
         
-        response = unpack_server_payload(data)
-        if response is None:
-            continue
-        
-        result, rank, suit = response
-        
-        # Check if we got a card
-        if rank > 0:
-            dealer_cards.append((rank, suit))
-            dealer_total = sum(card_value(r) for r, s in dealer_cards)
-            print(f"  Dealer draws: {format_card_colored(rank, suit)} (Total: {dealer_total})")
+        for data in drain_frames(SERVER_PAYLOAD_SIZE):
+            received = True
+            
+            response = unpack(data)
+            if response is None:
+                continue
+            
+            result, rank, suit = response
+            
+            # Check if we got a card
+            if rank > 0:
+                dealer_cards.append((rank, suit))
+                dealer_total += card_values[rank]
+                print(f"  Dealer draws: {card_strings[(rank, suit)]} (Total: {dealer_total})")
+            
+            # Check for final result (later frames stay buffered for next round)
+            if result != RESULT_ONGOING:
+                round_over = True
+                break
         
-        # Check for final result
-        if result != RESULT_ONGOING:
-            break
+        if not received:
+            return None  # Connection closed
     
     # =========================================================================
     # DISPLAY RESULT
     # =========================================================================
     
-    print()
-    
     if result == RESULT_WIN:
         stats.record_win()
     elif result == RESULT_LOSS:
@@ -395,10 +621,11 @@ def play_round(tcp_socket: socket.socket, stats: GameStats, show_stats: bool = T
     else:
         stats.record_tie()
     
-    print(display_result(
+    sys.stdout.write("\n" + display_result(
         result, player_total, dealer_total,
         stats.wins, stats.losses, stats.ties, show_stats
-    ))
+    ) + "\n")
+    sys.stdout.flush()
     
     return result
 
@@ -420,86 +647,186 @@ def main(show_stats: bool = True):
     # Show mode info
     if not show_stats:
         print()
-        print(f"  {colored('🎰 BONUS MODE: Playing without statistics!', Colors.YELLOW)}")
-        print(f"  {colored(f'   Wins award {POINTS_WIN_NO_STATS} points (2x bonus!)', Colors.GREEN)}")
+        print(f"  {BONUS_MODE_MSG}")
+        print(f"  {BONUS_POINTS_MSG}")
     
     print()
     
-    while True:
-        # Reset stats for each new game session (no_stats_mode = bonus points mode)
-        stats = GameStats(no_stats_mode=not show_stats)
-        # Ask for number of rounds
+    # One offer socket for every session in this run
+    udp_socket = create_offer_socket()
+    
+    try:
         while True:
+            # Reset stats for each new game session (no_stats_mode = bonus points mode)
+            stats = GameStats(no_stats_mode=not show_stats)
+            # Ask for number of rounds
+            while True:
+                try:
+                    num_rounds = input(f"\n  How many rounds do you want to play? (1-255): ").strip()
+                    num_rounds = int(num_rounds)
+                    if 1 <= num_rounds <= 255:
+                        break
+                    print(f"  {ROUNDS_RANGE_MSG}")
+                except ValueError:
+                    print(f"  {ROUNDS_INVALID_MSG}")
+                except (EOFError, KeyboardInterrupt):
+                    print(f"\n{GOODBYE_MSG}")
+                    return
+            
+            print()
+            
+            # Listen for server offer
             try:
-                num_rounds = input(f"\n  How many rounds do you want to play? (1-255): ").strip()
-                num_rounds = int(num_rounds)
-                if 1 <= num_rounds <= 255:
-                    break
-                print(f"  {colored('Please enter a number between 1 and 255.', Colors.RED)}")
-            except ValueError:
-                print(f"  {colored('Please enter a valid number.', Colors.RED)}")
-            except (EOFError, KeyboardInterrupt):
-                print(f"\n{colored('Goodbye!', Colors.GREEN)}")
+                server_ip, tcp_port, server_name = listen_for_offer(udp_socket)
+            except KeyboardInterrupt:
+                print(f"\n{GOODBYE_MSG}")
                 return
+            
+            # Play game
+            play_game(server_ip, tcp_port, server_name, num_rounds, stats, show_stats)
+            
+            # Print session summary
+            if show_stats:
+                summary = (
+                    f"\n{SUMMARY_SEPARATOR}\n"
+                    f"  Finished playing {num_rounds} rounds\n"
+                    f"  Win rate: {stats.win_rate():.1f}%\n"
+                    f"  Points earned: {colored(str(stats.points), Colors.YELLOW)} ⭐\n"
+                    f"  Total: {stats}\n"
+                    f"{SUMMARY_SEPARATOR}\n\n"
+                )
+            else:
+                # No-stats mode - still show points earned (that's the reward!)
+                summary = (
+                    f"\n{SUMMARY_SEPARATOR}\n"
+                    f"  Finished playing {num_rounds} rounds\n"
+                    f"  {BONUS_EARNED_LABEL} {colored(str(stats.points), Colors.GREEN)} ⭐\n"
+                    f"{SUMMARY_SEPARATOR}\n\n"
+                )
+            sys.stdout.write(summary)
+            sys.stdout.flush()
+            
+            # Always offer to submit to leaderboard (points are the incentive!)
+            _offer_leaderboard_submit(stats)
+            
+            # Ask what to do next
+            print(NEXT_ACTION_MENU)
+            
+            try:
+                next_action = input(NEXT_ACTION_PROMPT).strip()
+                
+                # Show any leaderboard submission that finished meanwhile
+                _report_submit_outcomes()
+                
+                if next_action == '2':
+                    # Return to main menu
+                    return "menu"
+                elif next_action == '3':
+                    # Exit
+                    print(f"\n{THANKS_MSG}")
+                    return "exit"
+                # Default: play again (continue the loop)
+            except (EOFError, KeyboardInterrupt):
+                print(f"\n{GOODBYE_MSG}")
+                return "exit"
+    finally:
+        udp_socket.close()
+        # Don't leave the menu with a submission still in flight
+        _wait_for_submits()
+
+
+# =============================================================================
+# LEADERBOARD SUBMISSION
+# =============================================================================
+
+# Submissions are sent by a background thread so the menu never waits on the
+# leaderboard server; outcomes are reported back to the main thread.
+submit_queue: "queue.Queue[dict]" = queue.Queue()
+submit_outcomes: "queue.Queue[Tuple[str, object]]" = queue.Queue()
+submit_thread: Optional[threading.Thread] = None
+
+
+def _submit_worker():
+    """
+    Send queued results to the leaderboard.
+    Everything queued while the previous send was in flight goes out as one
+    batch, and each submission gets exactly one outcome.
+    """
+    from leaderboard_client import LeaderboardClient
+    
+    client = LeaderboardClient()
+    while True:
+        # Take everything queued so far and send it as one batch
+        submissions = [submit_queue.get()]
+        while True:
+            try:
+                submissions.append(submit_queue.get_nowait())
+            except queue.Empty:
+                break
         
-        print()
-        
-        # Listen for server offer
         try:
-            server_ip, tcp_port, server_name = listen_for_offer()
-        except KeyboardInterrupt:
-            print(f"\n{colored('Goodbye!', Colors.GREEN)}")
+            if not client.is_available():
+                outcomes = [("unavailable", None)] * len(submissions)
+            elif len(submissions) == 1:
+                result = client.submit_results(**submissions[0])
+                outcomes = [("submitted" if result else "failed", result)]
+            else:
+                players = client.submit_batch(submissions) or []
+                outcomes = [("submitted", player) for player in players]
+            
+            # The server should answer for every submission; any it skipped
+            # count as failed and any extra answers are ignored
+            outcomes = outcomes[:len(submissions)]
+            outcomes += [("failed", None)] * (len(submissions) - len(outcomes))
+            for outcome in outcomes:
+                submit_outcomes.put(outcome)
+        except Exception as e:
+            for _ in submissions:
+                submit_outcomes.put(("error", e))
+        finally:
+            # Once per dequeued submission, whatever happened, so
+            # _wait_for_submits() can never hang or over-count
+            for _ in submissions:
+                submit_queue.task_done()
+
+
+def _report_submit_outcomes():
+    """Print the outcome of every submission that has finished (non-blocking)."""
+    while True:
+        try:
+            status, result = submit_outcomes.get_nowait()
+        except queue.Empty:
             return
         
-        # Play game
-        play_game(server_ip, tcp_port, server_name, num_rounds, stats, show_stats)
-        
-        # Print session summary
-        if show_stats:
-            print(f"\n{colored('='*50, Colors.GREEN)}")
-            print(f"  Finished playing {num_rounds} rounds")
-            print(f"  Win rate: {stats.win_rate():.1f}%")
-            print(f"  Points earned: {colored(str(stats.points), Colors.YELLOW)} ⭐")
-            print(f"  Total: {stats}")
-            print(f"{colored('='*50, Colors.GREEN)}\n")
+        if status == "submitted":
+            sys.stdout.write(
+                f"\n  {SUBMIT_OK_MSG}\n"
+                f"  Your total record: {result['wins']}W / {result['losses']}L / {result['ties']}T\n"
+                f"  Total points: {colored(str(result.get('points', 0)), Colors.YELLOW)} ⭐\n"
+                f"  Overall win rate: {result['win_rate']:.1f}%\n\n"
+            )
+        elif status == "unavailable":
+            sys.stdout.write(f"  {LEADERBOARD_UNAVAILABLE_MSG}\n")
+        elif status == "failed":
+            sys.stdout.write(f"  {SUBMIT_FAILED_MSG}\n")
         else:
-            # No-stats mode - still show points earned (that's the reward!)
-            print(f"\n{colored('='*50, Colors.GREEN)}")
-            print(f"  Finished playing {num_rounds} rounds")
-            print(f"  {colored('🎰 BONUS POINTS EARNED:', Colors.YELLOW)} {colored(str(stats.points), Colors.GREEN)} ⭐")
-            print(f"{colored('='*50, Colors.GREEN)}\n")
-        
-        # Always offer to submit to leaderboard (points are the incentive!)
-        _offer_leaderboard_submit(stats)
-        
-        # Ask what to do next
-        print(f"\n{colored('='*50, Colors.CYAN)}")
-        print(f"  {colored('What would you like to do?', Colors.BOLD)}")
-        print(f"  {colored('1', Colors.GREEN)} - Play again")
-        print(f"  {colored('2', Colors.YELLOW)} - Back to main menu")
-        print(f"  {colored('3', Colors.RED)} - Exit")
-        print(f"{colored('='*50, Colors.CYAN)}\n")
-        
-        try:
-            next_action = input(f"  Enter your choice ({colored('1', Colors.GREEN)}/{colored('2', Colors.YELLOW)}/{colored('3', Colors.RED)}): ").strip()
-            
-            if next_action == '2':
-                # Return to main menu
-                return "menu"
-            elif next_action == '3':
-                # Exit
-                print(f"\n{colored('Thanks for playing! Goodbye! 🎰', Colors.GREEN)}")
-                return "exit"
-            # Default: play again (continue the loop)
-        except (EOFError, KeyboardInterrupt):
-            print(f"\n{colored('Goodbye!', Colors.GREEN)}")
-            return "exit"
+            sys.stdout.write(f"  {colored(f'Error submitting to leaderboard: {result}', Colors.RED)}\n")
+        sys.stdout.flush()
+
+
+def _wait_for_submits():
+    """Block until queued submissions are sent, then report their outcomes."""
+    if submit_thread is not None:
+        submit_queue.join()
+    _report_submit_outcomes()
 
 
 def _offer_leaderboard_submit(stats: GameStats):
     """Offer to submit results to the leaderboard."""
+    global submit_thread
+    
     try:
-        submit = input(f"  Submit results to leaderboard? ({colored('Y', Colors.GREEN)}/{colored('N', Colors.RED)}): ").strip().lower()
+        submit = input(SUBMIT_PROMPT).strip().lower()
         
         if submit not in ['y', 'yes']:
             return
@@ -507,37 +834,25 @@ def _offer_leaderboard_submit(stats: GameStats):
         # Get player name
         player_name = input(f"  Enter your name for the leaderboard: ").strip()
         if not player_name:
-            print(f"  {colored('No name entered, skipping submission.', Colors.YELLOW)}")
+            print(f"  {NO_NAME_MSG}")
             return
         
-        # Try to submit
-        from leaderboard_client import LeaderboardClient
+        # Hand the submission to the background thread
+        if submit_thread is None:
+            submit_thread = threading.Thread(target=_submit_worker, daemon=True)
+            submit_thread.start()
         
-        client = LeaderboardClient()
-        if not client.is_available():
-            print(f"  {colored('Leaderboard server is not available.', Colors.YELLOW)}")
-            return
-        
-        result = client.submit_results(
-            player_name=player_name,
-            wins=stats.wins,
-            losses=stats.losses,
-            ties=stats.ties,
-            points=stats.points
-        )
-        
-        if result:
-            print(f"\n  {colored('✅ Results submitted successfully!', Colors.GREEN)}")
-            print(f"  Your total record: {result['wins']}W / {result['losses']}L / {result['ties']}T")
-            print(f"  Total points: {colored(str(result.get('points', 0)), Colors.YELLOW)} ⭐")
-            print(f"  Overall win rate: {result['win_rate']:.1f}%\n")
-        else:
-            print(f"  {colored('Failed to submit results.', Colors.RED)}")
+        submit_queue.put({
+            "player_name": player_name,
+            "wins": stats.wins,
+            "losses": stats.losses,
+            "ties": stats.ties,
+            "points": stats.points
+        })
+        print(f"  {SUBMITTING_MSG}")
             
     except (EOFError, KeyboardInterrupt):
         print()
-    except Exception as e:
-        print(f"  {colored(f'Error submitting to leaderboard: {e}', Colors.RED)}")
 
 
 if __name__ == "__main__":
@@ -25,9 +25,50 @@ UDP_BROADCAST_PORT = 13122
 # Broadcast interval in seconds
 BROADCAST_INTERVAL = 1.0
 
+# Kernel buffer requested for the offer sockets, so bursts of offers from
+# several dealers aren't dropped (Linux caps it at net.core.rmem_max/wmem_max)
+UDP_SOCKET_BUFFER_SIZE = 12 * 1024 * 1024
+
+# Send offers to a multicast group instead of broadcasting them, so only
+# hosts running a client receive them. Off by default: networks without
+# multicast routing or IGMP snooping should keep using broadcast.
+USE_MULTICAST = False
+MULTICAST_GROUP = "239.255.42.99"  # Administratively scoped (site-local) group
+MULTICAST_TTL = 1                  # Don't leave the local network
+
+# Maximum number of queued offers read per wakeup when listening
+OFFER_BATCH_SIZE = 8
+
+# Seconds the client waits for an offer before checking for Ctrl+C again
+OFFER_POLL_INTERVAL = 0.5
+
 # Socket timeout in seconds (enough time for player to make decisions)
 SOCKET_TIMEOUT = 120.0
 
+# Stack reserved for each client handler thread. A game session never
+# recurses, so this is far more than it needs (the OS default is often 8 MiB)
+CLIENT_THREAD_STACK_SIZE = 512 * 1024
+
+# Connections the kernel queues for the dealer before it accepts them. A
+# short queue drops players who connect in a burst; they then retry only
+# after a SYN timeout of a second or more.
+LISTEN_BACKLOG = 128
+
+# Most games the dealer plays at once. Further players stay connected and
+# start as soon as a game ends.
+MAX_CONCURRENT_CLIENTS = 256
+
+# Buffer size for TCP reads (many small payloads fit in a single recv)
+TCP_RECV_BUFFER_SIZE = 4096
+
+# Pause between rounds in seconds (interactive sessions only, 0 to disable)
+ROUND_DELAY = 0.5
+
+# Print every card and decision of every round on the dealer's console.
+# Turn off for a dealer serving many players at once; connection events and
+# errors are still logged.
+SHOW_ROUND_DETAILS = True
+
 # =============================================================================
 # GAME RESULT CODES
 # =============================================================================
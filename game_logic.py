@@ -4,7 +4,9 @@ Contains card/deck management, value calculation, and odds calculator.
 """
 
 import random
-from typing import List, Tuple, Dict
+from functools import lru_cache
+from math import comb
+from typing import List, Tuple, Dict, Optional, Sequence
 from config import SUIT_SYMBOLS, RANK_NAMES
 
 
@@ -15,6 +17,8 @@ from config import SUIT_SYMBOLS, RANK_NAMES
 class Card:
     """Represents a playing card with rank and suit."""
     
+    __slots__ = ('rank', 'suit', '_value', '_str')
+    
     def __init__(self, rank: int, suit: int):
         """
         Create a new card.
@@ -25,6 +29,9 @@ class Card:
         """
         self.rank = rank
         self.suit = suit
+        # Both are fixed by (rank, suit), so compute them once
+        self._value = 11 if rank == 1 else (10 if rank >= 11 else rank)
+        self._str = f"{RANK_NAMES[rank]}{SUIT_SYMBOLS[suit]}"
     
     def value(self) -> int:
         """
@@ -33,39 +40,49 @@ class Card:
         Returns:
             int: Card value (Ace=11, Face cards=10, others=face value)
         """
-        if self.rank == 1:  # Ace
-            return 11
-        elif self.rank >= 11:  # Face cards (J, Q, K)
-            return 10
-        else:
-            return self.rank
+        return self._value
     
     def __str__(self) -> str:
         """Pretty print the card (e.g., 'A♠', 'K♥')."""
-        return f"{RANK_NAMES[self.rank]}{SUIT_SYMBOLS[self.suit]}"
+        return self._str
     
     def __repr__(self) -> str:
-        return self.__str__()
+        return self._str
 
 
 # =============================================================================
 # DECK CLASS
 # =============================================================================
 
+# One Card per (rank, suit), built once. Cards are never modified after
+# creation, so every deck shares these instances.
+DECK_TEMPLATE = tuple(Card(rank, suit) for suit in range(4) for rank in range(1, 14))
+
+
 class Deck:
     """A standard 52-card deck with shuffle and deal methods."""
     
-    def __init__(self):
-        """Create a new shuffled deck."""
-        self.reset()
+    def __init__(self, rng: Optional[random.Random] = None):
+        """
+        Create a new shuffled deck.
+        
+        Args:
+            rng: Random generator to deal from (default: the random module's
+                shared one)
+        """
+        self.cards = list(DECK_TEMPLATE)
+        self._randrange = (rng if rng is not None else random).randrange
     
     def reset(self):
-        """Reset and shuffle the deck."""
-        self.cards = []
-        for suit in range(4):
-            for rank in range(1, 14):
-                self.cards.append(Card(rank, suit))
-        random.shuffle(self.cards)
+        """
+        Reset the deck.
+        The deck is shuffled lazily: deal() picks a uniformly random card from
+        the ones left, so a round only pays for the cards it actually uses
+        instead of a full 52-card shuffle.
+        Refills the existing list, so a deck reused across rounds keeps
+        one allocation.
+        """
+        self.cards[:] = DECK_TEMPLATE
     
     def deal(self) -> Card:
         """
@@ -77,9 +94,15 @@ class Deck:
         Raises:
             IndexError: If deck is empty
         """
-        if not self.cards:
+        cards = self.cards
+        if not cards:
             self.reset()
-        return self.cards.pop()
+            cards = self.cards
+        
+        # One step of Fisher-Yates: move a random remaining card to the end
+        index = self._randrange(len(cards))
+        cards[index], cards[-1] = cards[-1], cards[index]
+        return cards.pop()
     
     def remaining(self) -> int:
         """Get the number of remaining cards in the deck."""
@@ -90,6 +113,10 @@ class Deck:
 # HAND VALUE CALCULATION
 # =============================================================================
 
+# Blackjack value indexed by rank (index 0 unused, Ace=11, J/Q/K=10)
+CARD_VALUES = (0, 11, 2, 3, 4, 5, 6, 7, 8, 9, 10, 10, 10, 10)
+
+
 def calculate_hand_value(cards: List[Card]) -> int:
     """
     Calculate the total value of a hand.
@@ -101,7 +128,21 @@ def calculate_hand_value(cards: List[Card]) -> int:
     Returns:
         int: Total hand value
     """
-    return sum(card.value() for card in cards)
+    return sum([card._value for card in cards])
+
+
+def calculate_hand_value_ranks(ranks: Sequence[int]) -> int:
+    """
+    Calculate the total value of a hand given only its ranks.
+    Used where hands are kept as plain rank lists instead of Card objects.
+    
+    Args:
+        ranks: Card ranks (1-13)
+        
+    Returns:
+        int: Total hand value
+    """
+    return sum([CARD_VALUES[rank] for rank in ranks])
 
 
 def card_value(rank: int) -> int:
@@ -114,12 +155,14 @@ def card_value(rank: int) -> int:
     Returns:
         int: Point value (Ace=11, Face=10, others=rank)
     """
-    if rank == 1:
-        return 11
-    elif rank >= 11:
-        return 10
-    else:
-        return rank
+    return CARD_VALUES[rank]
+
+
+# Display string for every (rank, suit), e.g. (1, 3) -> 'A♠'
+CARD_STRINGS = {
+    (rank, suit): f"{RANK_NAMES[rank]}{SUIT_SYMBOLS[suit]}"
+    for rank in RANK_NAMES for suit in SUIT_SYMBOLS
+}
 
 
 def format_card(rank: int, suit: int) -> str:
@@ -133,7 +176,7 @@ def format_card(rank: int, suit: int) -> str:
     Returns:
         str: Formatted card string (e.g., 'A♠', 'K♥')
     """
-    return f"{RANK_NAMES[rank]}{SUIT_SYMBOLS[suit]}"
+    return CARD_STRINGS[(rank, suit)]
 
 
 def format_hand(cards: List[Card]) -> str:
@@ -153,215 +196,361 @@ def format_hand(cards: List[Card]) -> str:
 # ODDS CALCULATOR
 # =============================================================================
 
-def get_remaining_deck_composition(known_cards: List[Tuple[int, int]]) -> Dict[int, int]:
+# Distinct card values in a deck, in the order used by composition keys
+DECK_VALUES = (2, 3, 4, 5, 6, 7, 8, 9, 10, 11)
+
+# Dealer outcome vectors are indexed by final hand value (0-21) plus a bust slot
+DEALER_BUST = 22
+DEALER_OUTCOME_SIZE = DEALER_BUST + 1
+
+# Full-deck count per value in DECK_VALUES
+FULL_COMPOSITION = (4, 4, 4, 4, 4, 4, 4, 4, 16, 4)
+
+# Maximum number of known-card multisets whose composition is memoized
+KNOWN_COMPOSITION_CACHE_SIZE = 4096
+
+# Maximum number of (total, composition) entries kept by simulate_dealer_draw
+DEALER_DRAW_CACHE_SIZE = 1 << 16
+
+# Dealer cache: only decks with at most this many cards removed are cached
+DEALER_CACHE_MAX_REMOVED = 16
+
+# MULTISET_COUNTS[j][n] = C(n + j - 1, j), the number of ways to remove j cards
+# drawn from n distinct values
+MULTISET_COUNTS = tuple(
+    tuple(comb(n + j - 1, j) if n + j > 0 else 1 for n in range(len(DECK_VALUES) + 1))
+    for j in range(DEALER_CACHE_MAX_REMOVED + 1)
+)
+
+# First address used by decks with exactly j cards removed
+DEALER_CACHE_OFFSETS = tuple(
+    sum(MULTISET_COUNTS[k][len(DECK_VALUES)] for k in range(j))
+    for j in range(DEALER_CACHE_MAX_REMOVED + 1)
+)
+
+# Dealer outcome vectors keyed by (dealer_visible_value, composition address).
+# Lives for the whole process, so it is shared by every round and session.
+dealer_cache: Dict[Tuple[int, int], List[float]] = {}
+
+
+def get_remaining_deck_composition(known_counts: List[int]) -> Dict[int, int]:
     """
     Calculate remaining cards in deck by value.
     
     Args:
-        known_cards: List of (rank, suit) tuples for known cards
+        known_counts: Number of known cards per rank, indexed by rank (1-13)
         
     Returns:
         Dict mapping card value to count remaining
     """
-    # Start with full deck composition by value
-    # Values 2-9: 4 each, Value 10: 16 (10, J, Q, K), Value 11 (Ace): 4
-    remaining = {
-        2: 4, 3: 4, 4: 4, 5: 4, 6: 4, 7: 4, 8: 4, 9: 4,
-        10: 16,  # 10, J, Q, K
-        11: 4    # Aces
-    }
+    return dict(zip(DECK_VALUES, composition_key(known_counts)))
+
+
+def count_ranks(cards: List[Tuple[int, int]]) -> List[int]:
+    """
+    Count cards per rank.
+    
+    Args:
+        cards: List of (rank, suit) tuples
+        
+    Returns:
+        List of 14 counts indexed by rank (index 0 unused)
+    """
+    counts = [0] * 14
+    for rank, suit in cards:
+        counts[rank] += 1
+    return counts
+
+
+def composition_key(known_counts: List[int]) -> Tuple[int, ...]:
+    """
+    Build a canonical, hashable key for the remaining deck.
+    The order in which cards were seen does not matter, so the same
+    composition reached through different hands shares one cache entry.
+    
+    Args:
+        known_counts: Number of known cards per rank, indexed by rank (1-13)
+        
+    Returns:
+        Tuple of remaining counts, one per value in DECK_VALUES
+    """
+    return _composition_for_known(tuple(known_counts))
+
+
+@lru_cache(maxsize=KNOWN_COMPOSITION_CACHE_SIZE)
+def _composition_for_known(known_counts: Tuple[int, ...]) -> Tuple[int, ...]:
+    """Memoized composition_key for one multiset of known cards."""
+    # Known cards per value in DECK_VALUES: ranks 2-9 map one-to-one,
+    # 10/J/Q/K share value 10 and the Ace is worth 11
+    known = list(known_counts[2:10])
+    known.append(known_counts[10] + known_counts[11] + known_counts[12] + known_counts[13])
+    known.append(known_counts[1])
+    
+    # Remove known cards from the full deck (never below zero)
+    return tuple([full - count if count < full else 0
+                  for full, count in zip(FULL_COMPOSITION, known)])
+
+
+def dealer_cache_address(composition: Tuple[int, ...]) -> Optional[int]:
+    """
+    Map a remaining-deck composition to a unique integer address.
+    The removed cards are treated as a multiset: their value indices are
+    sorted descending (r_1 >= ... >= r_j) and ranked with the combinatorial
+    number system, K = sum(C(r_i + k_i - 1, k_i)) with k_i = j - i + 1,
+    offset by the number of decks with fewer cards removed.
     
-    # Remove known cards
-    for rank, suit in known_cards:
-        value = card_value(rank)
-        if value in remaining and remaining[value] > 0:
-            remaining[value] -= 1
+    Args:
+        composition: Remaining count per value in DECK_VALUES
+        
+    Returns:
+        int: Cache address, or None if too many cards are removed to cache
+    """
+    removed = []
+    for index in range(len(DECK_VALUES) - 1, -1, -1):
+        removed.extend([index] * (FULL_COMPOSITION[index] - composition[index]))
     
-    return remaining
+    num_removed = len(removed)
+    if num_removed > DEALER_CACHE_MAX_REMOVED:
+        return None
+    
+    address = DEALER_CACHE_OFFSETS[num_removed]
+    for i, value_index in enumerate(removed):
+        address += MULTISET_COUNTS[num_removed - i][value_index]
+    return address
+
+
+def get_dealer_outcomes(dealer_visible_value: int,
+                        composition: Tuple[int, ...]) -> List[float]:
+    """
+    Get the dealer outcome distribution, using the persistent dealer cache.
+    
+    Args:
+        dealer_visible_value: Value of dealer's visible card
+        composition: Remaining count per value in DECK_VALUES
+        
+    Returns:
+        List of DEALER_OUTCOME_SIZE probabilities (see simulate_dealer_outcomes)
+    """
+    address = dealer_cache_address(composition)
+    if address is None:
+        return simulate_dealer_outcomes(dealer_visible_value, composition)
+    
+    key = (dealer_visible_value, address)
+    outcomes = dealer_cache.get(key)
+    if outcomes is None:
+        outcomes = simulate_dealer_outcomes(dealer_visible_value, composition)
+        dealer_cache[key] = outcomes
+    return outcomes
 
 
-def simulate_dealer_outcomes(dealer_visible_value: int, remaining_deck: Dict[int, int]) -> Tuple[float, float, float]:
+def simulate_dealer_outcomes(dealer_visible_value: int,
+                             composition: Tuple[int, ...]) -> List[float]:
     """
     Simulate all possible dealer outcomes.
     
     Args:
         dealer_visible_value: Value of dealer's visible card
-        remaining_deck: Dict of remaining card values
+        composition: Remaining count per value in DECK_VALUES
         
     Returns:
-        Tuple of (bust_probability, distribution of final values)
+        List of DEALER_OUTCOME_SIZE probabilities: index = final hand value
+        (0-21), index DEALER_BUST = dealer busts
     """
-    # This is a simplified simulation using probabilities
     # We calculate the probability distribution of dealer's final hand
+    outcomes = [0.0] * DEALER_OUTCOME_SIZE
     
-    total_remaining = sum(remaining_deck.values())
+    total_remaining = sum(composition)
     if total_remaining == 0:
-        return {}
-    
-    # Probability distribution of dealer's final hand value
-    outcomes = {}
+        return outcomes
     
     # Dealer has one visible card, we need to account for hidden card + draws
-    # Simplified: Calculate average outcomes
-    
-    # For each possible hidden card value
-    for hidden_value, hidden_count in remaining_deck.items():
+    states = {}
+    for index, hidden_count in enumerate(composition):
         if hidden_count <= 0:
             continue
-            
-        hidden_prob = hidden_count / total_remaining
-        dealer_total = dealer_visible_value + hidden_value
-        
-        # Simulate dealer drawing until >= 17
-        # This is recursive but we'll simplify with averages
-        # Create deck with hidden card removed
-        deck_after_hidden = remaining_deck.copy()
-        deck_after_hidden[hidden_value] -= 1
-        final_values = simulate_dealer_draw(dealer_total, deck_after_hidden)
         
-        for value, prob in final_values.items():
-            if value not in outcomes:
-                outcomes[value] = 0
-            outcomes[value] += hidden_prob * prob
+        # Dealer state with the hidden card removed from the deck
+        deck_after_hidden = composition[:index] + (hidden_count - 1,) + composition[index + 1:]
+        states[(dealer_visible_value + DECK_VALUES[index], deck_after_hidden)] = hidden_count / total_remaining
     
+    propagate_dealer_draws(states, total_remaining - 1, outcomes)
     return outcomes
 
 
-def simulate_dealer_draw(current_total: int, remaining_deck: Dict[int, int]) -> Dict[int, float]:
+@lru_cache(maxsize=DEALER_DRAW_CACHE_SIZE)
+def simulate_dealer_draw(current_total: int, composition: Tuple[int, ...]) -> List[float]:
     """
-    Recursively simulate dealer drawing cards.
+    Simulate dealer drawing cards from a single starting state.
+    Memoized on (current_total, composition). The returned list is shared
+    and must not be modified by callers.
     
     Args:
         current_total: Dealer's current hand total
-        remaining_deck: Dict of remaining card values (already adjusted for known cards)
+        composition: Remaining count per value in DECK_VALUES
+            (already adjusted for known cards)
         
     Returns:
-        Dict mapping final hand value (or 'bust') to probability
+        List of DEALER_OUTCOME_SIZE probabilities: index = final hand value
+        (0-21), index DEALER_BUST = dealer busts
     """
-    # Dealer stands on 17+
-    if current_total >= 17:
-        if current_total > 21:
-            return {'bust': 1.0}
-        return {current_total: 1.0}
-    
-    total_remaining = sum(remaining_deck.values())
-    if total_remaining == 0:
-        return {current_total: 1.0}
-    
-    outcomes = {}
+    outcomes = [0.0] * DEALER_OUTCOME_SIZE
+    propagate_dealer_draws({(current_total, composition): 1.0}, sum(composition), outcomes)
+    return outcomes
+
+
+def propagate_dealer_draws(states: Dict[Tuple[int, Tuple[int, ...]], float],
+                           total_remaining: int, outcomes: List[float]):
+    """
+    Run the dealer's draws as a table DP instead of a recursion.
+    Each pass draws one more card for every state still under 17; states
+    reached through different draw orders share one (total, composition)
+    entry, so each one is expanded once.
     
-    for draw_value, draw_count in remaining_deck.items():
-        if draw_count <= 0:
-            continue
-            
-        draw_prob = draw_count / total_remaining
-        new_total = current_total + draw_value
+    Args:
+        states: Probability mass per (dealer_total, composition) state
+        total_remaining: Cards left in each state's composition (every
+            state in a pass has drawn the same number of cards)
+        outcomes: DEALER_OUTCOME_SIZE list the final probabilities are added to
+    """
+    # Bins that are empty in every starting state stay empty, so drop them
+    # once here rather than testing them for every state
+    active_bins = [(index, value) for index, value in enumerate(DECK_VALUES)
+                   if any(composition[index] for _, composition in states)]
+    
+    while states:
+        if total_remaining <= 0:
+            # Deck exhausted - dealer keeps the current total
+            for (current_total, _), mass in states.items():
+                outcomes[min(current_total, DEALER_BUST)] += mass
+            return
         
-        # Create a new deck with this card removed for recursive simulation
-        next_deck = remaining_deck.copy()
-        next_deck[draw_value] -= 1
+        next_states = {}
+        next_get = next_states.get
         
-        # Recursively simulate
-        sub_outcomes = simulate_dealer_draw(new_total, next_deck)
+        for (current_total, composition), mass in states.items():
+            # Dealer stands on 17+
+            if current_total >= 17:
+                outcomes[min(current_total, DEALER_BUST)] += mass
+                continue
+            
+            mass /= total_remaining
+            for index, value in active_bins:
+                draw_count = composition[index]
+                if draw_count <= 0:
+                    continue
+                
+                new_total = current_total + value
+                if new_total >= 17:
+                    # Final hand - no need to build the next composition
+                    outcomes[new_total if new_total < DEALER_BUST else DEALER_BUST] += mass * draw_count
+                    continue
+                
+                # Move this state's mass to the state with the card drawn
+                key = (new_total, composition[:index] + (draw_count - 1,) + composition[index + 1:])
+                next_states[key] = next_get(key, 0.0) + mass * draw_count
         
-        for value, prob in sub_outcomes.items():
-            if value not in outcomes:
-                outcomes[value] = 0
-            outcomes[value] += draw_prob * prob
-    
-    return outcomes
+        states = next_states
+        total_remaining -= 1
 
 
 def calculate_odds_if_stand(player_total: int, dealer_visible_value: int, 
-                            known_cards: List[Tuple[int, int]]) -> Tuple[float, float, float]:
+                            known_counts: List[int]) -> Tuple[float, float, float]:
     """
     Calculate win/lose/tie probabilities if player stands.
     
     Args:
         player_total: Player's current hand total
         dealer_visible_value: Value of dealer's visible card
-        known_cards: List of (rank, suit) tuples for all known cards
+        known_counts: Number of known cards per rank, indexed by rank (1-13)
         
     Returns:
         Tuple of (win_prob, lose_prob, tie_prob) as percentages (0-100)
     """
-    remaining_deck = get_remaining_deck_composition(known_cards)
-    dealer_outcomes = simulate_dealer_outcomes(dealer_visible_value, remaining_deck)
-    
-    win_prob = 0.0
-    lose_prob = 0.0
-    tie_prob = 0.0
-    
-    for outcome, prob in dealer_outcomes.items():
-        if outcome == 'bust':
-            win_prob += prob
-        elif outcome > player_total:
-            lose_prob += prob
-        elif outcome < player_total:
-            win_prob += prob
-        else:
-            tie_prob += prob
-    
-    # Normalize and convert to percentages
-    total = win_prob + lose_prob + tie_prob
-    if total > 0:
-        win_prob = (win_prob / total) * 100
-        lose_prob = (lose_prob / total) * 100
-        tie_prob = (tie_prob / total) * 100
-    
-    return (round(win_prob, 1), round(lose_prob, 1), round(tie_prob, 1))
+    composition = composition_key(known_counts)
+    return _odds_if_stand(player_total, dealer_visible_value, composition)
 
 
 def calculate_odds_if_hit(player_total: int, dealer_visible_value: int,
-                          known_cards: List[Tuple[int, int]]) -> Tuple[float, float, float]:
+                          known_counts: List[int]) -> Tuple[float, float, float]:
     """
     Calculate win/lose/tie probabilities if player hits.
     
     Args:
         player_total: Player's current hand total
         dealer_visible_value: Value of dealer's visible card
-        known_cards: List of (rank, suit) tuples for all known cards
+        known_counts: Number of known cards per rank, indexed by rank (1-13)
         
     Returns:
         Tuple of (win_prob, lose_prob, tie_prob) as percentages (0-100)
     """
-    remaining_deck = get_remaining_deck_composition(known_cards)
-    total_remaining = sum(remaining_deck.values())
+    composition = composition_key(known_counts)
+    return _odds_if_hit(player_total, dealer_visible_value, composition)
+
+
+@lru_cache(maxsize=None)
+def _odds_if_stand(player_total: int, dealer_visible_value: int,
+                   composition: Tuple[int, ...]) -> Tuple[float, float, float]:
+    """Memoized stand odds for a canonical remaining-deck composition."""
+    dealer_outcomes = get_dealer_outcomes(dealer_visible_value, composition)
+    
+    # Dealer busts or finishes below the player -> win, above -> lose
+    split = min(player_total, DEALER_BUST)
+    win_prob = dealer_outcomes[DEALER_BUST] + sum(dealer_outcomes[:split])
+    tie_prob = dealer_outcomes[player_total] if player_total < DEALER_BUST else 0.0
+    lose_prob = sum(dealer_outcomes[split + 1:DEALER_BUST])
+    
+    # Normalize and convert to percentages
+    total = win_prob + lose_prob + tie_prob
+    if total > 0:
+        win_prob = (win_prob / total) * 100
+        lose_prob = (lose_prob / total) * 100
+        tie_prob = (tie_prob / total) * 100
+    
+    return (round(win_prob, 1), round(lose_prob, 1), round(tie_prob, 1))
+
+
+@lru_cache(maxsize=None)
+def _odds_if_hit(player_total: int, dealer_visible_value: int,
+                 composition: Tuple[int, ...]) -> Tuple[float, float, float]:
+    """Memoized hit odds for a canonical remaining-deck composition."""
+    total_remaining = sum(composition)
     
     if total_remaining == 0:
         return (0.0, 100.0, 0.0)
     
+    # Highest draw value that does not bust
+    bust_threshold = 21 - player_total
+    if bust_threshold < DECK_VALUES[0]:
+        # Every possible draw busts
+        return (0.0, 100.0, 0.0)
+    
     win_prob = 0.0
     lose_prob = 0.0
     tie_prob = 0.0
     
     # For each possible card we could draw
-    for draw_value, draw_count in remaining_deck.items():
+    for index, draw_count in enumerate(composition):
+        draw_value = DECK_VALUES[index]
+        
+        if draw_value > bust_threshold:
+            # DECK_VALUES is ascending, so this and every later draw busts
+            lose_prob += sum(composition[index:]) / total_remaining
+            break
+        
         if draw_count <= 0:
             continue
-            
+        
         draw_prob = draw_count / total_remaining
         new_total = player_total + draw_value
         
-        if new_total > 21:
-            # Bust - we lose
-            lose_prob += draw_prob
-        else:
-            # We don't bust - calculate odds if we stand with new total
-            # Add the drawn card to known cards (use rank that matches value)
-            new_known = known_cards.copy()
-            if draw_value == 11:
-                new_known.append((1, 0))  # Ace
-            elif draw_value == 10:
-                new_known.append((10, 0))  # Use 10 (could be J/Q/K but value is same)
-            else:
-                new_known.append((draw_value, 0))  # 2-9 have rank == value
-            
-            stand_odds = calculate_odds_if_stand(new_total, dealer_visible_value, new_known)
-            
-            win_prob += draw_prob * (stand_odds[0] / 100)
-            lose_prob += draw_prob * (stand_odds[1] / 100)
-            tie_prob += draw_prob * (stand_odds[2] / 100)
+        # We don't bust - calculate odds if we stand with new total,
+        # with the drawn card removed from the deck
+        next_composition = composition[:index] + (draw_count - 1,) + composition[index + 1:]
+        stand_odds = _odds_if_stand(new_total, dealer_visible_value, next_composition)
+        
+        win_prob += draw_prob * (stand_odds[0] / 100)
+        lose_prob += draw_prob * (stand_odds[1] / 100)
+        tie_prob += draw_prob * (stand_odds[2] / 100)
     
     # Convert to percentages
     win_prob *= 100
@@ -372,21 +561,37 @@ def calculate_odds_if_hit(player_total: int, dealer_visible_value: int,
 
 
 def get_recommendation(player_total: int, dealer_visible_value: int,
-                       known_cards: List[Tuple[int, int]]) -> Tuple[str, float, float]:
+                       known_counts: List[int]) -> Tuple[str, float, float]:
     """
     Get the recommended action (Hit or Stand) with odds.
     
     Args:
         player_total: Player's current hand total
         dealer_visible_value: Value of dealer's visible card
-        known_cards: List of (rank, suit) tuples for all known cards
+        known_counts: Number of known cards per rank, indexed by rank (1-13)
         
     Returns:
         Tuple of (recommendation, hit_win_prob, stand_win_prob)
     """
-    hit_odds = calculate_odds_if_hit(player_total, dealer_visible_value, known_cards)
-    stand_odds = calculate_odds_if_stand(player_total, dealer_visible_value, known_cards)
+    composition = composition_key(known_counts)
+    return recommend_from_odds(
+        _odds_if_hit(player_total, dealer_visible_value, composition),
+        _odds_if_stand(player_total, dealer_visible_value, composition)
+    )
+
+
+def recommend_from_odds(hit_odds: Tuple[float, float, float],
+                        stand_odds: Tuple[float, float, float]) -> Tuple[str, float, float]:
+    """
+    Get the recommended action from odds that were already calculated.
     
+    Args:
+        hit_odds: (win, lose, tie) percentages if player hits
+        stand_odds: (win, lose, tie) percentages if player stands
+        
+    Returns:
+        Tuple of (recommendation, hit_win_prob, stand_win_prob)
+    """
     hit_win = hit_odds[0]
     stand_win = stand_odds[0]
     
@@ -415,9 +620,9 @@ if __name__ == "__main__":
     player_cards = [(10, 0), (5, 1)]  # 10♥, 5♦
     dealer_visible = (7, 3)  # 7♠
     
-    player_total = card_value(10) + card_value(5)
+    player_total = calculate_hand_value_ranks([rank for rank, suit in player_cards])
     dealer_value = card_value(7)
-    known = player_cards + [dealer_visible]
+    known = count_ranks(player_cards + [dealer_visible])
     
     print(f"Player total: {player_total}")
     print(f"Dealer shows: {dealer_value}")
@@ -3,9 +3,9 @@ Leaderboard Client - API for interacting with the leaderboard server.
 Used by game clients to submit results and fetch leaderboards.
 """
 
+import http.client
 import json
-import urllib.request
-import urllib.error
+import threading
 import urllib.parse
 from typing import Optional, List, Dict
 
@@ -17,6 +17,10 @@ DEFAULT_LEADERBOARD_HOST = "localhost"
 DEFAULT_LEADERBOARD_PORT = 8888
 REQUEST_TIMEOUT = 5  # seconds
 
+# Request bodies are sent compact; one encoder instance serves every request
+JSON_ENCODER = json.JSONEncoder(separators=(",", ":"))
+JSON_HEADERS = {"Content-Type": "application/json"}
+
 # =============================================================================
 # LEADERBOARD CLIENT
 # =============================================================================
@@ -33,6 +37,16 @@ class LeaderboardClient:
             port: Leaderboard server port
         """
         self.base_url = f"http://{host}:{port}"
+        
+        # One kept-alive connection shared by every request; it reconnects
+        # by itself after the server closes it
+        self._conn = http.client.HTTPConnection(host, port, timeout=REQUEST_TIMEOUT)
+        self._lock = threading.Lock()
+    
+    def close(self):
+        """Close the connection to the leaderboard server."""
+        with self._lock:
+            self._conn.close()
     
     def _request(self, method: str, endpoint: str, data: Optional[dict] = None) -> Optional[dict]:
         """
@@ -46,31 +60,37 @@ class LeaderboardClient:
         Returns:
             dict: Response data or None if error
         """
-        url = f"{self.base_url}{endpoint}"
+        if method == "GET":
+            body = None
+            headers = {}
+        else:
+            body = JSON_ENCODER.encode(data).encode() if data else None
+            headers = JSON_HEADERS
+        
+        with self._lock:
+            for attempt in range(2):
+                reused = self._conn.sock is not None
+                try:
+                    self._conn.request(method, endpoint, body=body, headers=headers)
+                    response = self._conn.getresponse()
+                    payload = response.read()
+                except ConnectionError:
+                    # A kept-alive connection the server already closed;
+                    # the request never reached it, so retry once on a new one
+                    self._conn.close()
+                    if reused and attempt == 0:
+                        continue
+                    return None
+                except Exception:
+                    self._conn.close()
+                    return None
+                break
         
+        # Error responses carry a JSON body too ({"error": ...}); callers
+        # look at its fields just as they would a successful one
         try:
-            if method == "GET":
-                req = urllib.request.Request(url)
-            else:
-                json_data = json.dumps(data).encode() if data else None
-                req = urllib.request.Request(
-                    url, 
-                    data=json_data,
-                    headers={"Content-Type": "application/json"}
-                )
-                req.method = method
-            
-            with urllib.request.urlopen(req, timeout=REQUEST_TIMEOUT) as response:
-                return json.loads(response.read().decode())
-                
-        except urllib.error.URLError:
-            return None
-        except urllib.error.HTTPError as e:
-            try:
-                return json.loads(e.read().decode())
-            except:
-                return None
-        except Exception:
+            return json.loads(payload)
+        except ValueError:
             return None
     
     def is_available(self) -> bool:
@@ -104,6 +124,22 @@ class LeaderboardClient:
             return result.get("player")
         return None
     
+    def submit_batch(self, entries: List[dict]) -> Optional[List[dict]]:
+        """
+        Submit several game results in one request.
+        
+        Args:
+            entries: Dicts with player_name, wins, losses, ties and points
+            
+        Returns:
+            list: Updated player stats, one per entry, or None if error
+        """
+        result = self._request("POST", "/submit_batch", {"entries": entries})
+        
+        if result and result.get("success"):
+            return result.get("players")
+        return None
+    
     def get_leaderboard(self, limit: int = 10) -> Optional[List[dict]]:
         """
         Fetch the leaderboard.
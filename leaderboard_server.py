@@ -5,12 +5,18 @@ Uses SQLite for persistence.
 """
 
 import json
+import os
+import queue
 import sqlite3
 import threading
-from http.server import HTTPServer, BaseHTTPRequestHandler
-from urllib.parse import urlparse, parse_qs
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import unquote_plus
 from datetime import datetime
-from typing import Optional
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Iterator, Optional, List, Dict, Set, Tuple
 
 # =============================================================================
 # CONFIGURATION
@@ -18,28 +24,205 @@ from typing import Optional
 
 LEADERBOARD_PORT = 8888
 DB_FILE = "leaderboard.db"
+KEEPALIVE_TIMEOUT = 15  # seconds an idle kept-alive connection stays open
+RESPONSE_BUFFER_SIZE = 8192  # bytes buffered per response before sending
+LEADERBOARD_MAX = 100   # largest leaderboard a client can ask for
+LEADERBOARD_WARM_LIMITS = (10, 25, 50, 100)  # limits encoded ahead of requests
+
+# SQLite tuning, applied to every connection
+DB_CACHE_SIZE_KB = 64000      # page cache per connection
+DB_BUSY_TIMEOUT_MS = 30000    # wait this long for a lock instead of failing
+DB_OPTIMIZE_INTERVAL = 15 * 60  # seconds between PRAGMA optimize runs
+READER_POOL_SIZE = os.cpu_count() or 4  # idle read-only connections kept open
+SCHEMA_VERSION = 2            # stored in PRAGMA user_version once the schema is set up
+
+# Group commit: submissions arriving close together share one transaction
+WRITE_COALESCE_WINDOW = 0.01  # seconds to wait for more submissions
+WRITE_BATCH_SIZE = 64         # most submissions applied per transaction
+SQL_MAX_PARAMS = 500          # names looked up per IN (...) query
+PLAYER_CACHE_SIZE = 10000     # player totals the writer remembers between batches
 
 # =============================================================================
 # DATABASE
 # =============================================================================
 
+# Win rate as a percentage with one decimal, 0 before any games
+WIN_RATE_SQL = """
+    CASE WHEN games_played > 0
+         THEN round(wins * 100.0 / games_played, 1)
+         ELSE 0 END
+"""
+
+# Create the player or add to their totals
+UPSERT_PLAYER_SQL = """
+    INSERT INTO players (name, wins, losses, ties, games_played, points, last_played)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(name) DO UPDATE SET
+        wins = wins + excluded.wins,
+        losses = losses + excluded.losses,
+        ties = ties + excluded.ties,
+        games_played = games_played + excluded.games_played,
+        points = points + excluded.points,
+        last_played = excluded.last_played
+"""
+
+
+# Compact JSON for response bodies: no indentation or spaces after separators
+JSON_ENCODER = json.JSONEncoder(separators=(",", ":"))
+
+
+def calculate_win_rate(wins: int, games: int) -> float:
+    """
+    Compute a win rate the way WIN_RATE_SQL does.
+    SQLite's round() rounds halves away from zero, unlike Python's round().
+    
+    Args:
+        wins: Games won
+        games: Games played
+        
+    Returns:
+        float: Percentage with one decimal, or 0 before any games
+    """
+    if games <= 0:
+        return 0
+    rate = Decimal(wins * 100) / Decimal(games)
+    return float(rate.quantize(Decimal("0.1"), rounding=ROUND_HALF_UP))
+
+
+def encode_json(data) -> bytes:
+    """Encode a response body as JSON bytes."""
+    return JSON_ENCODER.encode(data).encode()
+
+
+class PendingWrite:
+    """A submission waiting for the writer thread to commit it."""
+    
+    __slots__ = ("entries", "done", "results", "error")
+    
+    def __init__(self, entries: List[dict]):
+        self.entries = entries
+        self.done = threading.Event()
+        self.results: Optional[List[dict]] = None
+        self.error: Optional[BaseException] = None
+
+
 class LeaderboardDB:
     """SQLite-backed leaderboard database."""
     
     def __init__(self, db_file: str = DB_FILE):
         self.db_file = db_file
         self.lock = threading.Lock()
+        
+        # One writer connection, only used while holding self.lock, and a
+        # pool of read-only connections shared by the handler threads, so a
+        # new client connection doesn't have to open its own
+        self._writer = self._connect()
+        # Totals of recently written players, kept by the writer thread so
+        # it can report them without reading the rows back
+        self._player_cache: Dict[str, dict] = {}
+        self._readers: "queue.SimpleQueue[sqlite3.Connection]" = queue.SimpleQueue()
+        
+        # Snapshot of the top LEADERBOARD_MAX players plus encoded responses
+        # per limit, rebuilt on the first read after a write marks it dirty.
+        # Every write bumps _lb_version; the snapshot's ETag names the version
+        # it was built from, prefixed with the start time so it changes when
+        # the server restarts.
+        self._lb_lock = threading.Lock()
+        self._lb_dirty = True
+        self._lb_version = 0
+        self._lb_epoch = int(time.time())
+        self._lb_etag = ""
+        self._lb_top: List[dict] = []
+        self._lb_cache: Dict[int, bytes] = {}
+        
         self._init_db()
+        self._schedule_optimize()
+        self._warm_leaderboard()
+        
+        # Submissions are queued for a single writer thread, which commits
+        # everything that arrives within WRITE_COALESCE_WINDOW together
+        self._write_queue: "queue.Queue[PendingWrite]" = queue.Queue()
+        self._write_thread = threading.Thread(target=self._write_loop, daemon=True)
+        self._write_thread.start()
     
-    def _get_connection(self) -> sqlite3.Connection:
-        """Get a database connection."""
-        conn = sqlite3.connect(self.db_file)
-        conn.row_factory = sqlite3.Row
+    def _connect(self, read_only: bool = False) -> sqlite3.Connection:
+        """
+        Open a configured database connection.
+        
+        Args:
+            read_only: Open the file read-only (an in-memory database can't
+                be shared, so it always gets a regular connection)
+            
+        Returns:
+            sqlite3.Connection: New connection
+        """
+        if read_only and self.db_file != ":memory:":
+            uri = f"{Path(self.db_file).resolve().as_uri()}?mode=ro"
+            conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+        else:
+            conn = sqlite3.connect(self.db_file, check_same_thread=False)
+        # Per-connection settings: one fsync per commit in WAL mode, temp
+        # tables in memory, a larger page cache and waiting on locks
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute(f"PRAGMA cache_size=-{DB_CACHE_SIZE_KB}")
+        conn.execute(f"PRAGMA busy_timeout={DB_BUSY_TIMEOUT_MS}")
         return conn
     
+    @contextmanager
+    def _reader(self) -> Iterator[sqlite3.Connection]:
+        """
+        Borrow a read-only connection from the pool, opening one if it's empty.
+        Finish with every cursor before the block ends.
+        
+        Yields:
+            sqlite3.Connection: Connection to read with
+        """
+        if self.db_file == ":memory:":
+            # An in-memory database only exists on the writer connection,
+            # which the writer thread may be using at the same time
+            with self.lock:
+                yield self._writer
+            return
+        
+        try:
+            conn = self._readers.get_nowait()
+        except queue.Empty:
+            conn = self._connect(read_only=True)
+        try:
+            yield conn
+        finally:
+            if self._readers.qsize() < READER_POOL_SIZE:
+                self._readers.put(conn)
+            else:
+                conn.close()
+    
+    def _schedule_optimize(self):
+        """Run PRAGMA optimize now and then every DB_OPTIMIZE_INTERVAL seconds."""
+        try:
+            with self.lock:
+                self._writer.execute("PRAGMA optimize")
+        except sqlite3.Error:
+            pass  # Only a planner hint; try again next time
+        
+        timer = threading.Timer(DB_OPTIMIZE_INTERVAL, self._schedule_optimize)
+        timer.daemon = True
+        timer.start()
+    
     def _init_db(self):
         """Initialize the database schema."""
-        with self._get_connection() as conn:
+        with self._writer as conn:
+            # WAL lets readers run while a write is in progress; the setting
+            # is stored in the database file. In-memory databases can't use it.
+            if self.db_file != ":memory:":
+                conn.execute("PRAGMA journal_mode=WAL")
+            
+            # Databases already at this schema version need no DDL
+            if conn.execute("PRAGMA user_version").fetchone()[0] >= SCHEMA_VERSION:
+                return
+            
+            # Create and migrate in one transaction, recording the version
+            conn.execute("BEGIN IMMEDIATE")
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS players (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -53,15 +236,30 @@ class LeaderboardDB:
                     created_at TEXT DEFAULT CURRENT_TIMESTAMP
                 )
             """)
+            # Covers the leaderboard query: rows come back in order straight
+            # from the index, without looking up the table. It replaces the
+            # old points-only index.
             conn.execute("""
-                CREATE INDEX IF NOT EXISTS idx_points ON players(points DESC)
+                CREATE INDEX IF NOT EXISTS idx_leaderboard ON players(
+                    points DESC, wins DESC, games_played ASC,
+                    name, losses, ties, last_played
+                )
             """)
+            conn.execute("DROP INDEX IF EXISTS idx_points")
             # Migration: add points column if it doesn't exist
             try:
                 conn.execute("ALTER TABLE players ADD COLUMN points INTEGER DEFAULT 0")
             except sqlite3.OperationalError:
                 pass  # Column already exists
-            conn.commit()
+            # Migration: win rate computed by SQLite from wins and games_played
+            try:
+                conn.execute(f"""
+                    ALTER TABLE players ADD COLUMN win_rate
+                    GENERATED ALWAYS AS ({WIN_RATE_SQL}) VIRTUAL
+                """)
+            except sqlite3.OperationalError:
+                pass  # Column already exists
+            conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
     
     def submit_result(self, player_name: str, wins: int, losses: int, ties: int, points: int = 0) -> dict:
         """
@@ -78,114 +276,277 @@ class LeaderboardDB:
         Returns:
             dict: Updated player stats
         """
-        with self.lock:
-            with self._get_connection() as conn:
-                # Check if player exists
-                cursor = conn.execute(
-                    "SELECT * FROM players WHERE name = ?", 
-                    (player_name,)
-                )
-                existing = cursor.fetchone()
-                
-                games = wins + losses + ties
-                now = datetime.now().isoformat()
-                
-                if existing:
-                    # Update existing player
-                    conn.execute("""
-                        UPDATE players 
-                        SET wins = wins + ?,
-                            losses = losses + ?,
-                            ties = ties + ?,
-                            games_played = games_played + ?,
-                            points = points + ?,
-                            last_played = ?
-                        WHERE name = ?
-                    """, (wins, losses, ties, games, points, now, player_name))
-                else:
-                    # Create new player
-                    conn.execute("""
-                        INSERT INTO players (name, wins, losses, ties, games_played, points, last_played)
-                        VALUES (?, ?, ?, ?, ?, ?, ?)
-                    """, (player_name, wins, losses, ties, games, points, now))
-                
-                conn.commit()
-                
-                # Fetch updated stats
-                cursor = conn.execute(
-                    "SELECT * FROM players WHERE name = ?", 
-                    (player_name,)
-                )
-                player = cursor.fetchone()
-                
-                return {
-                    "name": player["name"],
-                    "wins": player["wins"],
-                    "losses": player["losses"],
-                    "ties": player["ties"],
-                    "games_played": player["games_played"],
-                    "points": player["points"],
-                    "win_rate": round(player["wins"] / player["games_played"] * 100, 1) if player["games_played"] > 0 else 0
+        return self.submit_results([{
+            "player_name": player_name,
+            "wins": wins,
+            "losses": losses,
+            "ties": ties,
+            "points": points
+        }])[0]
+    
+    def submit_results(self, entries: List[dict]) -> List[dict]:
+        """
+        Submit several game results in a single transaction.
+        Blocks until the writer thread has committed them.
+        
+        Args:
+            entries: Dicts with player_name, wins, losses, ties and points
+            
+        Returns:
+            list: Updated player stats, one per entry
+        """
+        pending = PendingWrite(entries)
+        self._write_queue.put(pending)
+        pending.done.wait()
+        if pending.error is not None:
+            raise pending.error
+        return pending.results
+    
+    def _write_loop(self):
+        """Writer thread: commit queued submissions in batches, forever."""
+        while True:
+            batch = [self._write_queue.get()]
+            deadline = time.monotonic() + WRITE_COALESCE_WINDOW
+            while len(batch) < WRITE_BATCH_SIZE:
+                remaining = deadline - time.monotonic()
+                try:
+                    if remaining > 0:
+                        batch.append(self._write_queue.get(timeout=remaining))
+                    else:
+                        batch.append(self._write_queue.get_nowait())
+                except queue.Empty:
+                    break
+            
+            # One timestamp for the whole batch, taken before locking;
+            # clients only show the date, so seconds are precise enough
+            now = datetime.now().isoformat(timespec="seconds")
+            
+            with self.lock:
+                try:
+                    self._commit_batch(batch, now)
+                except Exception:
+                    # One bad submission rolled back the whole batch; retry
+                    # each on its own so only that one reports the error
+                    for pending in batch:
+                        try:
+                            self._commit_batch([pending], now)
+                        except Exception as e:
+                            pending.error = e
+                finally:
+                    self._lb_version += 1
+                    self._lb_dirty = True
+            
+            for pending in batch:
+                pending.done.set()
+            
+            # Rebuild the snapshot here rather than on the next GET
+            self._warm_leaderboard()
+    
+    def _commit_batch(self, batch: List[PendingWrite], now: str):
+        """
+        Apply a batch of submissions in one transaction (hold self.lock).
+        Results are only stored on the submissions once the commit succeeds.
+        
+        Args:
+            batch: Submissions to apply
+            now: ISO timestamp stored as every player's last_played
+        """
+        entries = [entry for pending in batch for entry in pending.entries]
+        rows = [
+            (entry["player_name"], entry["wins"], entry["losses"], entry["ties"],
+             entry["wins"] + entry["losses"] + entry["ties"], entry.get("points", 0), now)
+            for entry in entries
+        ]
+        
+        # Commits on success, rolls back if anything fails
+        with self._writer as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            # Totals before this batch: from the cache, or read once for
+            # players the writer hasn't seen yet
+            names = {entry["player_name"] for entry in entries}
+            players = {name: self._player_cache[name] for name in names & self._player_cache.keys()}
+            players.update(self._fetch_players(conn, names - players.keys()))
+            conn.executemany(UPSERT_PLAYER_SQL, rows)
+        
+        # Add each entry to the running totals, so every entry reports the
+        # player's stats right after it, as separate submissions would
+        for pending in batch:
+            pending.results = []
+            for entry in pending.entries:
+                name = entry["player_name"]
+                before = players.get(name)
+                wins = entry["wins"] + (before["wins"] if before else 0)
+                games = (entry["wins"] + entry["losses"] + entry["ties"]
+                         + (before["games_played"] if before else 0))
+                player = {
+                    "name": name,
+                    "wins": wins,
+                    "losses": entry["losses"] + (before["losses"] if before else 0),
+                    "ties": entry["ties"] + (before["ties"] if before else 0),
+                    "games_played": games,
+                    "points": entry.get("points", 0) + (before["points"] if before else 0),
+                    "win_rate": calculate_win_rate(wins, games)
+                }
+                players[name] = player
+                pending.results.append(player)
+        
+        if len(self._player_cache) + len(names) > PLAYER_CACHE_SIZE:
+            self._player_cache.clear()
+        self._player_cache.update(players)
+    
+    def _fetch_players(self, conn: sqlite3.Connection, names: Set[str]) -> Dict[str, dict]:
+        """
+        Read the current stats of several players.
+        
+        Args:
+            conn: Connection to read with
+            names: Player names to look up
+            
+        Returns:
+            dict: Player stats keyed by name
+        """
+        players = {}
+        names = list(names)
+        for start in range(0, len(names), SQL_MAX_PARAMS):
+            chunk = names[start:start + SQL_MAX_PARAMS]
+            cursor = conn.execute(f"""
+                SELECT name, wins, losses, ties, games_played, points, win_rate
+                FROM players
+                WHERE name IN ({", ".join("?" * len(chunk))})
+            """, chunk)
+            for name, wins, losses, ties, games, points, win_rate in cursor:
+                players[name] = {
+                    "name": name,
+                    "wins": wins,
+                    "losses": losses,
+                    "ties": ties,
+                    "games_played": games,
+                    "points": points or 0,
+                    "win_rate": win_rate
                 }
+        return players
     
     def get_leaderboard(self, limit: int = 10) -> list:
         """
         Get the top players leaderboard (sorted by points).
         
+        Args:
+            limit: Maximum number of players to return (at most LEADERBOARD_MAX)
+            
+        Returns:
+            list: Top players sorted by points
+        """
+        with self._lb_lock:
+            return self._top_players()[:limit]
+    
+    def get_leaderboard_response(self, limit: int = 10) -> Tuple[str, bytes]:
+        """
+        Get the encoded /leaderboard response body for a limit.
+        
+        Args:
+            limit: Maximum number of players to return (at most LEADERBOARD_MAX)
+            
+        Returns:
+            tuple: (ETag of the snapshot, JSON body with the leaderboard and its size)
+        """
+        with self._lb_lock:
+            return self._lb_etag, self._leaderboard_body(limit)
+    
+    def _warm_leaderboard(self):
+        """Rebuild a stale snapshot and pre-encode the common limits."""
+        try:
+            with self._lb_lock:
+                for limit in LEADERBOARD_WARM_LIMITS:
+                    self._leaderboard_body(limit)
+        except sqlite3.Error:
+            pass  # The next request rebuilds it instead
+    
+    def _leaderboard_body(self, limit: int) -> bytes:
+        """Get the encoded response for a limit, encoding it on first use; hold _lb_lock."""
+        top = self._top_players()
+        body = self._lb_cache.get(limit)
+        if body is None:
+            leaderboard = top[:limit]
+            body = encode_json({
+                "leaderboard": leaderboard,
+                "total_players": len(leaderboard)
+            })
+            self._lb_cache[limit] = body
+        return body
+    
+    def _top_players(self) -> List[dict]:
+        """Return the top players snapshot, rebuilding it if stale; hold _lb_lock."""
+        if self._lb_dirty:
+            # Cleared before querying, so a write that commits while the
+            # query runs marks the snapshot stale again
+            self._lb_dirty = False
+            self._lb_etag = f'W/"{self._lb_epoch}-{self._lb_version}"'
+            self._lb_top = self._query_leaderboard(LEADERBOARD_MAX)
+            self._lb_cache = {}
+        return self._lb_top
+    
+    def _query_leaderboard(self, limit: int) -> List[dict]:
+        """
+        Read the top players from the database.
+        
         Args:
             limit: Maximum number of players to return
             
         Returns:
             list: Top players sorted by points
         """
-        with self._get_connection() as conn:
-            cursor = conn.execute("""
-                SELECT name, wins, losses, ties, games_played, points, last_played
+        with self._reader() as conn:
+            # Selecting the generated win_rate column would read the table for
+            # every row, so the same expression is computed from indexed columns
+            cursor = conn.execute(f"""
+                SELECT name, wins, losses, ties, games_played, points,
+                       {WIN_RATE_SQL} AS win_rate, last_played
                 FROM players
                 ORDER BY points DESC, wins DESC, games_played ASC
                 LIMIT ?
             """, (limit,))
             
-            players = []
-            for rank, row in enumerate(cursor.fetchall(), 1):
-                games = row["games_played"]
-                players.append({
+            # Build the result straight from the cursor, without fetchall()'s
+            # intermediate list of rows
+            return [
+                {
                     "rank": rank,
-                    "name": row["name"],
-                    "wins": row["wins"],
-                    "losses": row["losses"],
-                    "ties": row["ties"],
+                    "name": name,
+                    "wins": wins,
+                    "losses": losses,
+                    "ties": ties,
                     "games_played": games,
-                    "points": row["points"] or 0,
-                    "win_rate": round(row["wins"] / games * 100, 1) if games > 0 else 0,
-                    "last_played": row["last_played"]
-                })
-            
-            return players
+                    "points": points or 0,
+                    "win_rate": win_rate,
+                    "last_played": last_played
+                }
+                for rank, (name, wins, losses, ties, games, points, win_rate, last_played)
+                in enumerate(cursor, 1)
+            ]
     
     def get_player(self, player_name: str) -> Optional[dict]:
         """Get stats for a specific player."""
-        with self._get_connection() as conn:
-            cursor = conn.execute(
-                "SELECT * FROM players WHERE name = ?", 
-                (player_name,)
-            )
-            row = cursor.fetchone()
-            
-            if not row:
-                return None
-            
-            games = row["games_played"]
-            return {
-                "name": row["name"],
-                "wins": row["wins"],
-                "losses": row["losses"],
-                "ties": row["ties"],
-                "games_played": games,
-                "points": row["points"] or 0,
-                "win_rate": round(row["wins"] / games * 100, 1) if games > 0 else 0,
-                "last_played": row["last_played"]
-            }
+        with self._reader() as conn:
+            row = conn.execute("""
+                SELECT name, wins, losses, ties, games_played, points, win_rate, last_played
+                FROM players
+                WHERE name = ?
+            """, (player_name,)).fetchone()
+        
+        if not row:
+            return None
+        
+        name, wins, losses, ties, games, points, win_rate, last_played = row
+        return {
+            "name": name,
+            "wins": wins,
+            "losses": losses,
+            "ties": ties,
+            "games_played": games,
+            "points": points or 0,
+            "win_rate": win_rate,
+            "last_played": last_played
+        }
 
 
 # =============================================================================
@@ -199,31 +560,85 @@ db: Optional[LeaderboardDB] = None
 class LeaderboardHandler(BaseHTTPRequestHandler):
     """HTTP request handler for the leaderboard API."""
     
+    # HTTP/1.1 keeps connections alive so clients can reuse them; each
+    # connection has its own thread, and idle ones are dropped after a while
+    protocol_version = "HTTP/1.1"
+    timeout = KEEPALIVE_TIMEOUT
+    # Buffer responses so headers and body go out in one send; the base
+    # handler flushes after every request
+    wbufsize = RESPONSE_BUFFER_SIZE
+    
     def _send_json(self, data: dict, status: int = 200):
         """Send a JSON response."""
+        self._send_body(encode_json(data), status)
+    
+    def _send_body(self, body: bytes, status: int = 200, etag: Optional[str] = None):
+        """Send an already encoded JSON body."""
         self.send_response(status)
         self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        if etag:
+            self.send_header("ETag", etag)
         self.send_header("Access-Control-Allow-Origin", "*")
         self.end_headers()
-        self.wfile.write(json.dumps(data, indent=2).encode())
+        self.wfile.write(body)
+    
+    def _send_not_modified(self, etag: str):
+        """Tell the client its cached copy is still current."""
+        self.send_response(304)
+        self.send_header("ETag", etag)
+        self.send_header("Access-Control-Allow-Origin", "*")
+        self.end_headers()
+    
+    def _etag_matches(self, etag: str) -> bool:
+        """Check whether the request's If-None-Match lists etag."""
+        if_none_match = self.headers.get("If-None-Match")
+        if not if_none_match:
+            return False
+        return any(tag.strip() == etag for tag in if_none_match.split(","))
     
     def _send_error(self, message: str, status: int = 400):
         """Send an error response."""
         self._send_json({"error": message}, status)
     
+    @staticmethod
+    def _missing_field(data: dict) -> Optional[str]:
+        """Return the first required submission field missing from data."""
+        for field in ("player_name", "wins", "losses", "ties"):
+            if field not in data:
+                return field
+        return None
+    
+    @staticmethod
+    def _query_param(query: str, key: str) -> Optional[str]:
+        """
+        Get the first non-empty value of a query string parameter.
+        
+        Args:
+            query: Query string, without the leading '?'
+            key: Parameter name
+            
+        Returns:
+            str: Decoded value, or None if the parameter is missing or blank
+        """
+        prefix = key + "="
+        for pair in query.split("&"):
+            if pair.startswith(prefix) and len(pair) > len(prefix):
+                return unquote_plus(pair[len(prefix):])
+        return None
+    
     def do_OPTIONS(self):
         """Handle CORS preflight requests."""
         self.send_response(200)
         self.send_header("Access-Control-Allow-Origin", "*")
         self.send_header("Access-Control-Allow-Methods", "GET, POST, OPTIONS")
         self.send_header("Access-Control-Allow-Headers", "Content-Type")
+        self.send_header("Content-Length", "0")
         self.end_headers()
     
     def do_GET(self):
         """Handle GET requests."""
-        parsed = urlparse(self.path)
-        path = parsed.path
-        query = parse_qs(parsed.query)
+        path, _, query = self.path.partition("?")
         
         if path == "/" or path == "/health":
             # Health check
@@ -233,24 +648,27 @@ class LeaderboardHandler(BaseHTTPRequestHandler):
                 "endpoints": {
                     "GET /leaderboard": "Get top players",
                     "GET /player?name=<name>": "Get player stats",
-                    "POST /submit": "Submit game results"
+                    "POST /submit": "Submit game results",
+                    "POST /submit_batch": "Submit several game results at once"
                 }
             })
         
         elif path == "/leaderboard":
             # Get leaderboard
-            limit = int(query.get("limit", [10])[0])
-            limit = min(max(limit, 1), 100)  # Clamp between 1-100
+            limit = int(self._query_param(query, "limit") or 10)
+            limit = min(max(limit, 1), LEADERBOARD_MAX)  # Clamp between 1-100
             
-            leaderboard = db.get_leaderboard(limit)
-            self._send_json({
-                "leaderboard": leaderboard,
-                "total_players": len(leaderboard)
-            })
+            # Served from the snapshot, already encoded; clients that already
+            # have that snapshot just get a 304
+            etag, body = db.get_leaderboard_response(limit)
+            if self._etag_matches(etag):
+                self._send_not_modified(etag)
+            else:
+                self._send_body(body, etag=etag)
         
         elif path == "/player":
             # Get specific player
-            name = query.get("name", [None])[0]
+            name = self._query_param(query, "name")
             if not name:
                 self._send_error("Missing 'name' parameter")
                 return
@@ -266,8 +684,7 @@ class LeaderboardHandler(BaseHTTPRequestHandler):
     
     def do_POST(self):
         """Handle POST requests."""
-        parsed = urlparse(self.path)
-        path = parsed.path
+        path = self.path.partition("?")[0]
         
         if path == "/submit":
             # Submit game results
@@ -277,15 +694,14 @@ class LeaderboardHandler(BaseHTTPRequestHandler):
                 data = json.loads(body)
                 
                 # Validate required fields
-                required = ["player_name", "wins", "losses", "ties"]
-                for field in required:
-                    if field not in data:
-                        self._send_error(f"Missing required field: {field}")
-                        return
+                missing = self._missing_field(data)
+                if missing:
+                    self._send_error(f"Missing required field: {missing}")
+                    return
                 
                 # Submit to database
                 result = db.submit_result(
-                    player_name=data["player_name"],
+                    player_name=str(data["player_name"]),
                     wins=int(data["wins"]),
                     losses=int(data["losses"]),
                     ties=int(data["ties"]),
@@ -305,9 +721,60 @@ class LeaderboardHandler(BaseHTTPRequestHandler):
             except Exception as e:
                 self._send_error(f"Server error: {e}", 500)
         
+        elif path == "/submit_batch":
+            # Submit several game results in one transaction
+            try:
+                content_length = int(self.headers.get("Content-Length", 0))
+                body = self.rfile.read(content_length).decode()
+                data = json.loads(body)
+                
+                entries = data.get("entries")
+                if not isinstance(entries, list):
+                    self._send_error("Missing required field: entries")
+                    return
+                
+                # Validate every entry before touching the database
+                for entry in entries:
+                    missing = self._missing_field(entry)
+                    if missing:
+                        self._send_error(f"Missing required field: {missing}")
+                        return
+                
+                results = db.submit_results([
+                    {
+                        "player_name": str(entry["player_name"]),
+                        "wins": int(entry["wins"]),
+                        "losses": int(entry["losses"]),
+                        "ties": int(entry["ties"]),
+                        "points": int(entry.get("points", 0))
+                    }
+                    for entry in entries
+                ])
+                
+                self._send_json({
+                    "success": True,
+                    "message": f"{len(results)} results submitted successfully",
+                    "players": results
+                })
+                
+            except json.JSONDecodeError:
+                self._send_error("Invalid JSON")
+            except (ValueError, AttributeError) as e:
+                self._send_error(f"Invalid data: {e}")
+            except Exception as e:
+                self._send_error(f"Server error: {e}", 500)
+        
         else:
+            # The request body was not read, so the connection can't be reused
+            self.close_connection = True
             self._send_error("Not found", 404)
     
+    def log_error(self, format, *args):
+        """Log errors, except idle kept-alive connections timing out."""
+        if args and isinstance(args[0], TimeoutError):
+            return
+        super().log_error(format, *args)
+    
     def log_message(self, format, *args):
         """Custom log format."""
         print(f"[Leaderboard] {self.address_string()} - {args[0]}")
@@ -326,7 +793,10 @@ def main():
     
     # Start server
     server_address = ("", LEADERBOARD_PORT)
-    httpd = HTTPServer(server_address, LeaderboardHandler)
+    # One thread per connection, so slow or idle clients don't hold up others
+    # and reads run concurrently on their per-thread connections
+    httpd = ThreadingHTTPServer(server_address, LeaderboardHandler)
+    httpd.daemon_threads = True
     
     print("=" * 60)
     print("  🏆 BLACKJACK LEADERBOARD SERVER")
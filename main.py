@@ -3,18 +3,156 @@ Main entry point for the Blackjack game.
 Allows user to choose between running as a client (player) or server (dealer).
 """
 
-import socket
 import sys
 import time
 from typing import Optional, Tuple
 
-from config import UDP_BROADCAST_PORT
-from protocol import unpack_offer
+from config import (
+    UDP_BROADCAST_PORT, UDP_SOCKET_BUFFER_SIZE, USE_MULTICAST, MULTICAST_GROUP
+)
 from utils import (
     log_info, log_success, log_warning, log_error,
     display_welcome, display_leaderboard_intro, colored, Colors, draw_box
 )
 
+# =============================================================================
+# MENU TEXT
+# =============================================================================
+
+# Colored menu text is built once at import instead of on every redraw, and
+# each menu is a single block so it is written with one print
+
+# Main menu
+ROLE_MENU = "\n".join([
+    colored('=' * 60, Colors.CYAN),
+    f"  {colored('Choose your role:', Colors.BOLD)}",
+    f"  {colored('1', Colors.GREEN)} - Player (Client)",
+    f"  {colored('2', Colors.YELLOW)} - Dealer (Server)",
+    f"  {colored('3', Colors.CYAN)} - Instructions & Help",
+    f"  {colored('4', Colors.MAGENTA)} - 🏆 Leaderboard",
+    colored('=' * 60, Colors.CYAN),
+    "",
+])
+ROLE_MENU_PROMPT = f"  Enter your choice ({colored('1', Colors.GREEN)}/{colored('2', Colors.YELLOW)}/{colored('3', Colors.CYAN)}/{colored('4', Colors.MAGENTA)}): "
+ROLE_MENU_INVALID = f"  {colored('Invalid choice. Please enter 1, 2, 3, or 4.', Colors.RED)}\n"
+
+# Game mode menu
+MODE_MENU = "\n".join([
+    "",
+    colored('=' * 60, Colors.GREEN),
+    f"  {colored('Choose game mode:', Colors.BOLD)}",
+    f"  {colored('1', Colors.GREEN)} - With Statistics (10 pts per win)",
+    f"  {colored('2', Colors.YELLOW)} - Without Statistics {colored('(20 pts per win - 2x BONUS!)', Colors.CYAN)}",
+    f"  {colored('3', Colors.RED)} - Back to main menu",
+    colored('=' * 60, Colors.GREEN),
+    "",
+])
+MODE_MENU_INVALID = f"  {colored('Invalid choice. Please enter 1, 2, or 3.', Colors.RED)}\n"
+CHECKING_DEALERS_MSG = f"\n  {colored('Checking for available dealers...', Colors.CYAN)}\n"
+
+# No dealer menu
+NO_DEALER_MENU = "\n".join([
+    "",
+    colored('=' * 60, Colors.RED),
+    f"  {colored('❌ No dealer available!', Colors.RED)}",
+    f"  {colored('No dealers are currently broadcasting on the network.', Colors.YELLOW)}",
+    "",
+    f"  {colored('What would you like to do?', Colors.CYAN)}",
+    f"  {colored('1', Colors.GREEN)} - Try again (wait for a dealer)",
+    f"  {colored('2', Colors.YELLOW)} - Switch and become the dealer yourself",
+    f"  {colored('3', Colors.RED)} - Exit",
+    colored('=' * 60, Colors.RED),
+    "",
+])
+SWITCHING_TO_DEALER_MSG = f"\n  {colored('Switching to dealer mode...', Colors.CYAN)}\n"
+STARTING_DEALER_MSG = f"\n  {colored('Starting dealer (server)...', Colors.CYAN)}\n"
+
+# Shared by the game mode and no dealer menus
+THREE_CHOICE_PROMPT = f"  Enter your choice ({colored('1', Colors.GREEN)}/{colored('2', Colors.YELLOW)}/{colored('3', Colors.RED)}): "
+
+# Leaderboard menu
+LEADERBOARD_UNAVAILABLE_MSG = (
+    f"\n  {colored('❌ Leaderboard server is not available!', Colors.RED)}\n"
+    f"  {colored('Make sure leaderboard_server.py is running.', Colors.YELLOW)}\n"
+)
+LEADERBOARD_MENU = "\n".join([
+    "",
+    colored('=' * 60, Colors.YELLOW),
+    f"  {colored('🏆 LEADERBOARD MENU', Colors.BOLD)}",
+    f"  {colored('1', Colors.GREEN)} - View Top 10",
+    f"  {colored('2', Colors.CYAN)} - View Top 25",
+    f"  {colored('3', Colors.MAGENTA)} - Search Player",
+    f"  {colored('4', Colors.RED)} - Back to main menu",
+    colored('=' * 60, Colors.YELLOW),
+    "",
+])
+LEADERBOARD_FETCH_FAILED_MSG = f"\n  {colored('Could not fetch leaderboard.', Colors.RED)}"
+LEADERBOARD_INVALID_MSG = f"  {colored('Invalid choice.', Colors.RED)}"
+
+# Instructions screen
+INSTRUCTIONS_LINES = [
+    colored("📖 GAME OVERVIEW", Colors.CYAN),
+    "",
+    "Blackjack is a card game where you try to get a hand value",
+    "closer to 21 than the dealer without going over.",
+    "",
+    colored("🎯 OBJECTIVE", Colors.GREEN),
+    "",
+    "Beat the dealer by:",
+    "  • Getting 21 on your first two cards (Blackjack!)",
+    "  • Having a higher hand value than the dealer",
+    "  • Not going over 21 (busting)",
+    "",
+    colored("🎴 CARD VALUES", Colors.YELLOW),
+    "",
+    "  • Ace (A): 1 or 11 (whichever is better)",
+    "  • Face cards (J, Q, K): 10",
+    "  • Number cards: Their face value",
+    "",
+    colored("🎮 HOW TO PLAY", Colors.CYAN),
+    "",
+    "1. You receive 2 cards face up",
+    "2. The dealer receives 2 cards (one face up, one hidden)",
+    "3. On your turn, you can:",
+    "   " + colored("H", Colors.GREEN) + "it - Take another card",
+    "   " + colored("S", Colors.YELLOW) + "tand - Keep your current hand",
+    "4. If you go over 21, you bust and lose",
+    "5. After you stand, the dealer reveals their hidden card",
+    "6. Dealer must hit until they reach 17 or higher",
+    "7. Compare hands - closest to 21 wins!",
+    "",
+    colored("🌐 NETWORK GAME", Colors.MAGENTA),
+    "",
+    "This is a network-based Blackjack game:",
+    "",
+    colored("Dealer (Server):", Colors.YELLOW),
+    "  • Broadcasts game availability via UDP",
+    "  • Handles game logic and card dealing",
+    "  • Manages multiple players",
+    "",
+    colored("Player (Client):", Colors.GREEN),
+    "  • Listens for dealer broadcasts",
+    "  • Connects to dealer via TCP",
+    "  • Makes decisions and plays rounds",
+    "",
+    colored("💡 TIPS", Colors.CYAN),
+    "",
+    "  • The game shows odds calculations to help you decide",
+    "  • You can play multiple rounds in one session",
+    "  • Your win/loss record is tracked",
+    "  • A dealer must be running before you can play",
+    "",
+    colored("⚠️  IMPORTANT", Colors.RED),
+    "",
+    "  • You need a dealer (server) running to play as a client",
+    "  • Start the dealer first, then connect as a player",
+    "  • Both can run on the same machine or different machines",
+]
+INSTRUCTIONS_BOX = draw_box(INSTRUCTIONS_LINES, width=70, title="📚 GAME INSTRUCTIONS") + "\n"
+
+RETURN_TO_MENU_PROMPT = f"  Press {colored('Enter', Colors.CYAN)} to return to the main menu..."
+GOODBYE_MSG = colored('Goodbye!', Colors.GREEN)
+
 
 def check_dealer_available(timeout: float = 5.0) -> Optional[Tuple[str, int, str]]:
     """
@@ -26,56 +164,74 @@ def check_dealer_available(timeout: float = 5.0) -> Optional[Tuple[str, int, str
     Returns:
         Tuple of (server_ip, tcp_port, server_name) if found, None otherwise
     """
+    # Networking is only loaded once the menu actually needs it, so showing
+    # the menu or the instructions doesn't pay for it at startup
+    import selectors
+    import socket
+    from protocol import unpack_offer
+    from utils import set_socket_buffer, join_multicast_group
+    
     log_info(f"Checking for available dealers (timeout: {timeout}s)...")
     
     # Create UDP socket
     udp_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    # SO_REUSEADDR lets several clients on one host share the offer port and
+    # all receive each broadcast. SO_REUSEPORT is deliberately not set: for
+    # unicast datagrams it load-balances between sockets instead.
     udp_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-    
-    # On Windows, SO_REUSEPORT doesn't exist, use SO_REUSEADDR
-    try:
-        udp_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
-    except AttributeError:
-        pass  # SO_REUSEPORT not available on Windows
+    # Room for bursts of offers; whatever size the OS grants is fine
+    set_socket_buffer(udp_socket, socket.SO_RCVBUF, UDP_SOCKET_BUFFER_SIZE)
     
     udp_socket.bind(('', UDP_BROADCAST_PORT))
-    udp_socket.settimeout(timeout)
+    if USE_MULTICAST:
+        join_multicast_group(udp_socket, MULTICAST_GROUP)
+    udp_socket.setblocking(False)
+    
+    # One receive buffer for every datagram; offers are parsed straight out
+    # of it through a view instead of a fresh bytes object per packet
+    recv_buffer = bytearray(1024)
+    recv_view = memoryview(recv_buffer)
     
     try:
-        start_time = time.time()
-        while time.time() - start_time < timeout:
-            try:
-                remaining_time = timeout - (time.time() - start_time)
-                udp_socket.settimeout(remaining_time)
-                
-                data, addr = udp_socket.recvfrom(1024)
-                server_ip = addr[0]
-                
-                # Parse the offer
-                offer = unpack_offer(data)
-                if offer is None:
-                    continue
-                
-                tcp_port, server_name = offer
+        with selectors.DefaultSelector() as selector:
+            selector.register(udp_socket, selectors.EVENT_READ)
+            
+            # Block in the selector until a datagram arrives; only loop again
+            # if it wasn't a valid offer
+            deadline = time.monotonic() + timeout
+            remaining_time = timeout
+            while remaining_time > 0:
+                if not selector.select(remaining_time):
+                    # Timeout reached, no dealer found
+                    break
                 
-                log_success(f"Found dealer: {server_name} at {server_ip}:{tcp_port}")
-                udp_socket.close()
-                return (server_ip, tcp_port, server_name)
+                try:
+                    nbytes, addr = udp_socket.recvfrom_into(recv_buffer)
+                    server_ip = addr[0]
+                    
+                    # Parse the offer
+                    offer = unpack_offer(recv_view[:nbytes])
+                    if offer is not None:
+                        tcp_port, server_name = offer
+                        
+                        log_success(f"Found dealer: {server_name} at {server_ip}:{tcp_port}")
+                        return (server_ip, tcp_port, server_name)
+                    
+                except BlockingIOError:
+                    pass  # Readiness was spurious; wait again
+                except Exception as e:
+                    log_warning(f"Error receiving offer: {e}")
                 
-            except socket.timeout:
-                # Timeout reached, no dealer found
-                break
-            except Exception as e:
-                log_warning(f"Error receiving offer: {e}")
-                continue
+                remaining_time = deadline - time.monotonic()
         
-        udp_socket.close()
         return None
         
     except Exception as e:
         log_error(f"Error checking for dealer: {e}")
-        udp_socket.close()
         return None
+    
+    finally:
+        udp_socket.close()
 
 
 def run_client(show_stats: bool = True) -> str:
@@ -104,47 +260,36 @@ def display_leaderboard():
     client = LeaderboardClient()
     
     if not client.is_available():
-        print(f"\n  {colored('❌ Leaderboard server is not available!', Colors.RED)}")
-        print(f"  {colored('Make sure leaderboard_server.py is running.', Colors.YELLOW)}\n")
-        input(f"  Press {colored('Enter', Colors.CYAN)} to return to the main menu...")
+        print(LEADERBOARD_UNAVAILABLE_MSG)
+        input(RETURN_TO_MENU_PROMPT)
         print()
         return
     
     while True:
-        print()
-        print(f"{colored('='*60, Colors.YELLOW)}")
-        print(f"  {colored('🏆 LEADERBOARD MENU', Colors.BOLD)}")
-        print(f"  {colored('1', Colors.GREEN)} - View Top 10")
-        print(f"  {colored('2', Colors.CYAN)} - View Top 25")
-        print(f"  {colored('3', Colors.MAGENTA)} - Search Player")
-        print(f"  {colored('4', Colors.RED)} - Back to main menu")
-        print(f"{colored('='*60, Colors.YELLOW)}\n")
+        print(LEADERBOARD_MENU)
         
         lb_choice = input(f"  Enter your choice: ").strip()
         
         if lb_choice == '1':
             leaderboard = client.get_leaderboard(10)
             if leaderboard:
-                print()
-                print(format_leaderboard(leaderboard, "🏆 TOP 10 PLAYERS"))
+                print(f"\n{format_leaderboard(leaderboard, '🏆 TOP 10 PLAYERS')}")
             else:
-                print(f"\n  {colored('Could not fetch leaderboard.', Colors.RED)}")
+                print(LEADERBOARD_FETCH_FAILED_MSG)
         
         elif lb_choice == '2':
             leaderboard = client.get_leaderboard(25)
             if leaderboard:
-                print()
-                print(format_leaderboard(leaderboard, "🏆 TOP 25 PLAYERS"))
+                print(f"\n{format_leaderboard(leaderboard, '🏆 TOP 25 PLAYERS')}")
             else:
-                print(f"\n  {colored('Could not fetch leaderboard.', Colors.RED)}")
+                print(LEADERBOARD_FETCH_FAILED_MSG)
         
         elif lb_choice == '3':
             player_name = input(f"\n  Enter player name: ").strip()
             if player_name:
                 player = client.get_player(player_name)
                 if player:
-                    print()
-                    print(format_player_stats(player))
+                    print(f"\n{format_player_stats(player)}")
                 else:
                     msg = f'Player "{player_name}" not found.'
                     print(f"\n  {colored(msg, Colors.YELLOW)}")
@@ -154,136 +299,51 @@ def display_leaderboard():
             return
         
         else:
-            print(f"  {colored('Invalid choice.', Colors.RED)}")
+            print(LEADERBOARD_INVALID_MSG)
 
 
 def display_instructions():
     """Display game instructions and explanation."""
-    lines = [
-        colored("📖 GAME OVERVIEW", Colors.CYAN),
-        "",
-        "Blackjack is a card game where you try to get a hand value",
-        "closer to 21 than the dealer without going over.",
-        "",
-        colored("🎯 OBJECTIVE", Colors.GREEN),
-        "",
-        "Beat the dealer by:",
-        "  • Getting 21 on your first two cards (Blackjack!)",
-        "  • Having a higher hand value than the dealer",
-        "  • Not going over 21 (busting)",
-        "",
-        colored("🎴 CARD VALUES", Colors.YELLOW),
-        "",
-        "  • Ace (A): 1 or 11 (whichever is better)",
-        "  • Face cards (J, Q, K): 10",
-        "  • Number cards: Their face value",
-        "",
-        colored("🎮 HOW TO PLAY", Colors.CYAN),
-        "",
-        "1. You receive 2 cards face up",
-        "2. The dealer receives 2 cards (one face up, one hidden)",
-        "3. On your turn, you can:",
-        "   " + colored("H", Colors.GREEN) + "it - Take another card",
-        "   " + colored("S", Colors.YELLOW) + "tand - Keep your current hand",
-        "4. If you go over 21, you bust and lose",
-        "5. After you stand, the dealer reveals their hidden card",
-        "6. Dealer must hit until they reach 17 or higher",
-        "7. Compare hands - closest to 21 wins!",
-        "",
-        colored("🌐 NETWORK GAME", Colors.MAGENTA),
-        "",
-        "This is a network-based Blackjack game:",
-        "",
-        colored("Dealer (Server):", Colors.YELLOW),
-        "  • Broadcasts game availability via UDP",
-        "  • Handles game logic and card dealing",
-        "  • Manages multiple players",
-        "",
-        colored("Player (Client):", Colors.GREEN),
-        "  • Listens for dealer broadcasts",
-        "  • Connects to dealer via TCP",
-        "  • Makes decisions and plays rounds",
-        "",
-        colored("💡 TIPS", Colors.CYAN),
-        "",
-        "  • The game shows odds calculations to help you decide",
-        "  • You can play multiple rounds in one session",
-        "  • Your win/loss record is tracked",
-        "  • A dealer must be running before you can play",
-        "",
-        colored("⚠️  IMPORTANT", Colors.RED),
-        "",
-        "  • You need a dealer (server) running to play as a client",
-        "  • Start the dealer first, then connect as a player",
-        "  • Both can run on the same machine or different machines",
-    ]
+    print(INSTRUCTIONS_BOX)
     
-    print(draw_box(lines, width=70, title="📚 GAME INSTRUCTIONS"))
-    print()
-    
-    input(f"  Press {colored('Enter', Colors.CYAN)} to return to the main menu...")
+    input(RETURN_TO_MENU_PROMPT)
     print()
 
 
 def main():
     """Main entry point."""
-    print(display_welcome())
-    print(display_leaderboard_intro())
-    print()
+    print(f"{display_welcome()}\n{display_leaderboard_intro()}\n")
     
     while True:
         try:
-            print(f"{colored('='*60, Colors.CYAN)}")
-            print(f"  {colored('Choose your role:', Colors.BOLD)}")
-            print(f"  {colored('1', Colors.GREEN)} - Player (Client)")
-            print(f"  {colored('2', Colors.YELLOW)} - Dealer (Server)")
-            print(f"  {colored('3', Colors.CYAN)} - Instructions & Help")
-            print(f"  {colored('4', Colors.MAGENTA)} - 🏆 Leaderboard")
-            print(f"{colored('='*60, Colors.CYAN)}\n")
+            print(ROLE_MENU)
             
-            choice = input(f"  Enter your choice ({colored('1', Colors.GREEN)}/{colored('2', Colors.YELLOW)}/{colored('3', Colors.CYAN)}/{colored('4', Colors.MAGENTA)}): ").strip()
+            choice = input(ROLE_MENU_PROMPT).strip()
             
             if choice == '1':
                 # User wants to be a client (player) - ask about statistics
-                print()
-                print(f"{colored('='*60, Colors.GREEN)}")
-                print(f"  {colored('Choose game mode:', Colors.BOLD)}")
-                print(f"  {colored('1', Colors.GREEN)} - With Statistics (10 pts per win)")
-                print(f"  {colored('2', Colors.YELLOW)} - Without Statistics {colored('(20 pts per win - 2x BONUS!)', Colors.CYAN)}")
-                print(f"  {colored('3', Colors.RED)} - Back to main menu")
-                print(f"{colored('='*60, Colors.GREEN)}\n")
+                print(MODE_MENU)
                 
-                mode_choice = input(f"  Enter your choice ({colored('1', Colors.GREEN)}/{colored('2', Colors.YELLOW)}/{colored('3', Colors.RED)}): ").strip()
+                mode_choice = input(THREE_CHOICE_PROMPT).strip()
                 
                 if mode_choice == '3':
                     # Back to main menu
                     print()
                     continue
                 elif mode_choice not in ['1', '2']:
-                    print(f"  {colored('Invalid choice. Please enter 1, 2, or 3.', Colors.RED)}\n")
+                    print(MODE_MENU_INVALID)
                     continue
                 
                 show_stats = (mode_choice == '1')
                 
-                print()
-                print(f"  {colored('Checking for available dealers...', Colors.CYAN)}")
-                print()
+                print(CHECKING_DEALERS_MSG)
                 
                 dealer_info = check_dealer_available(timeout=5.0)
                 
                 if dealer_info is None:
-                    print()
-                    print(f"{colored('='*60, Colors.RED)}")
-                    print(f"  {colored('❌ No dealer available!', Colors.RED)}")
-                    print(f"  {colored('No dealers are currently broadcasting on the network.', Colors.YELLOW)}")
-                    print()
-                    print(f"  {colored('What would you like to do?', Colors.CYAN)}")
-                    print(f"  {colored('1', Colors.GREEN)} - Try again (wait for a dealer)")
-                    print(f"  {colored('2', Colors.YELLOW)} - Switch and become the dealer yourself")
-                    print(f"  {colored('3', Colors.RED)} - Exit")
-                    print(f"{colored('='*60, Colors.RED)}\n")
+                    print(NO_DEALER_MENU)
                     
-                    action = input(f"  Enter your choice ({colored('1', Colors.GREEN)}/{colored('2', Colors.YELLOW)}/{colored('3', Colors.RED)}): ").strip()
+                    action = input(THREE_CHOICE_PROMPT).strip()
                     
                     if action == '1':
                         # Try again
@@ -291,13 +351,12 @@ def main():
                         continue
                     elif action == '2':
                         # Switch to dealer
-                        print()
-                        print(f"  {colored('Switching to dealer mode...', Colors.CYAN)}\n")
+                        print(SWITCHING_TO_DEALER_MSG)
                         run_server()
                         break
                     else:
                         # Exit
-                        print(f"\n{colored('Goodbye!', Colors.GREEN)}")
+                        print(f"\n{GOODBYE_MSG}")
                         return
                 
                 # Dealer found, run client
@@ -313,8 +372,7 @@ def main():
                 
             elif choice == '2':
                 # User wants to be a server (dealer)
-                print()
-                print(f"  {colored('Starting dealer (server)...', Colors.CYAN)}\n")
+                print(STARTING_DEALER_MSG)
                 run_server()
                 break
                 
@@ -330,11 +388,11 @@ def main():
                 continue
                 
             else:
-                print(f"  {colored('Invalid choice. Please enter 1, 2, 3, or 4.', Colors.RED)}\n")
+                print(ROLE_MENU_INVALID)
                 continue
                 
         except (EOFError, KeyboardInterrupt):
-            print(f"\n{colored('Goodbye!', Colors.GREEN)}")
+            print(f"\n{GOODBYE_MSG}")
             return
         except Exception as e:
             log_error(f"Unexpected error: {e}")
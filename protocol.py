@@ -4,6 +4,7 @@ Provides functions to pack and unpack all message types.
 """
 
 import struct
+from typing import Optional, Tuple
 from config import (
     MAGIC_COOKIE, MSG_TYPE_OFFER, MSG_TYPE_REQUEST, MSG_TYPE_PAYLOAD,
     NAME_FIELD_SIZE, OFFER_PACKET_SIZE, REQUEST_PACKET_SIZE,
@@ -15,6 +16,10 @@ from config import (
 # HELPER FUNCTIONS
 # =============================================================================
 
+# Magic cookie as sent, shared by every message type
+COOKIE_BYTES = MAGIC_COOKIE.to_bytes(4, 'big')
+
+
 def pad_name(name: str) -> bytes:
     """
     Pad or truncate a name to exactly NAME_FIELD_SIZE bytes.
@@ -52,10 +57,8 @@ def validate_magic_cookie(data: bytes) -> bool:
     Returns:
         bool: True if valid, False otherwise
     """
-    if len(data) < 4:
-        return False
-    cookie = struct.unpack('>I', data[:4])[0]
-    return cookie == MAGIC_COOKIE
+    # Shorter packets slice to fewer bytes and never match
+    return data[:4] == COOKIE_BYTES
 
 
 # =============================================================================
@@ -63,6 +66,14 @@ def validate_magic_cookie(data: bytes) -> bool:
 # Format: Magic(4) + Type(1) + TCPPort(2) + ServerName(32) = 39 bytes
 # =============================================================================
 
+# Precompiled layout: Magic(I) + Type(b) + TCPPort(H) + ServerName(32s)
+OFFER_STRUCT = struct.Struct(f'>IbH{NAME_FIELD_SIZE}s')
+# The same layout split in two, so the header can be checked before the
+# name is copied out
+OFFER_HEADER_STRUCT = struct.Struct('>IbH')
+NAME_STRUCT = struct.Struct(f'{NAME_FIELD_SIZE}s')
+
+
 def pack_offer(tcp_port: int, server_name: str) -> bytes:
     """
     Create an offer packet for UDP broadcast.
@@ -74,15 +85,15 @@ def pack_offer(tcp_port: int, server_name: str) -> bytes:
     Returns:
         bytes: 39-byte offer packet
     """
-    return struct.pack(
-        '>IbH',  # Big-endian: uint32, byte, uint16
+    return OFFER_STRUCT.pack(
         MAGIC_COOKIE,
         MSG_TYPE_OFFER,
-        tcp_port
-    ) + pad_name(server_name)
+        tcp_port,
+        pad_name(server_name)
+    )
 
 
-def unpack_offer(data: bytes) -> tuple:
+def unpack_offer(data: bytes) -> Optional[Tuple[int, str]]:
     """
     Parse an offer packet.
     
@@ -92,20 +103,33 @@ def unpack_offer(data: bytes) -> tuple:
     Returns:
         tuple: (tcp_port, server_name) or None if invalid
     """
-    if len(data) < OFFER_PACKET_SIZE:
+    tcp_port = unpack_offer_port(data)
+    if tcp_port is None:
         return None
     
-    if not validate_magic_cookie(data):
-        return None
+    # Only a valid offer gets its name copied and decoded
+    name_bytes = NAME_STRUCT.unpack_from(data, OFFER_HEADER_STRUCT.size)[0]
+    return (tcp_port, unpad_name(name_bytes))
+
+
+def unpack_offer_port(data: bytes) -> Optional[int]:
+    """
+    Validate an offer packet and get its TCP port, without decoding the name.
     
-    msg_type = struct.unpack('>b', data[4:5])[0]
-    if msg_type != MSG_TYPE_OFFER:
+    Args:
+        data: Raw offer packet bytes
+        
+    Returns:
+        int: The server's TCP port, or None if invalid
+    """
+    if len(data) < OFFER_PACKET_SIZE:
         return None
     
-    tcp_port = struct.unpack('>H', data[5:7])[0]
-    server_name = unpad_name(data[7:39])
+    cookie, msg_type, tcp_port = OFFER_HEADER_STRUCT.unpack_from(data)
+    if cookie != MAGIC_COOKIE or msg_type != MSG_TYPE_OFFER:
+        return None
     
-    return (tcp_port, server_name)
+    return tcp_port
 
 
 # =============================================================================
@@ -113,6 +137,10 @@ def unpack_offer(data: bytes) -> tuple:
 # Format: Magic(4) + Type(1) + Rounds(1) + ClientName(32) = 38 bytes
 # =============================================================================
 
+# Precompiled layout: Magic(I) + Type(b) + Rounds(B) + ClientName(32s)
+REQUEST_STRUCT = struct.Struct(f'>IbB{NAME_FIELD_SIZE}s')
+
+
 def pack_request(num_rounds: int, client_name: str) -> bytes:
     """
     Create a request packet.
@@ -124,15 +152,15 @@ def pack_request(num_rounds: int, client_name: str) -> bytes:
     Returns:
         bytes: 38-byte request packet
     """
-    return struct.pack(
-        '>IbB',  # Big-endian: uint32, byte, unsigned byte
+    return REQUEST_STRUCT.pack(
         MAGIC_COOKIE,
         MSG_TYPE_REQUEST,
-        min(max(num_rounds, 1), 255)  # Clamp to 1-255
-    ) + pad_name(client_name)
+        min(max(num_rounds, 1), 255),  # Clamp to 1-255
+        pad_name(client_name)
+    )
 
 
-def unpack_request(data: bytes) -> tuple:
+def unpack_request(data: bytes) -> Optional[Tuple[int, str]]:
     """
     Parse a request packet.
     
@@ -145,17 +173,11 @@ def unpack_request(data: bytes) -> tuple:
     if len(data) < REQUEST_PACKET_SIZE:
         return None
     
-    if not validate_magic_cookie(data):
+    cookie, msg_type, num_rounds, name_bytes = REQUEST_STRUCT.unpack_from(data)
+    if cookie != MAGIC_COOKIE or msg_type != MSG_TYPE_REQUEST:
         return None
     
-    msg_type = struct.unpack('>b', data[4:5])[0]
-    if msg_type != MSG_TYPE_REQUEST:
-        return None
-    
-    num_rounds = struct.unpack('>B', data[5:6])[0]
-    client_name = unpad_name(data[6:38])
-    
-    return (num_rounds, client_name)
+    return (num_rounds, unpad_name(name_bytes))
 
 
 # =============================================================================
@@ -164,6 +186,20 @@ def unpack_request(data: bytes) -> tuple:
 # Decision is "Hittt" or "Stand"
 # =============================================================================
 
+# Precompiled layout: Magic(I) + Type(b) + Decision(5s)
+CLIENT_PAYLOAD_STRUCT = struct.Struct('>Ib5s')
+
+# There are only two client payloads, so both are packed once here
+HIT_PACKET = CLIENT_PAYLOAD_STRUCT.pack(MAGIC_COOKIE, MSG_TYPE_PAYLOAD, b'Hittt')
+STAND_PACKET = CLIENT_PAYLOAD_STRUCT.pack(MAGIC_COOKIE, MSG_TYPE_PAYLOAD, b'Stand')
+DECISION_PACKETS = {
+    'Hit': HIT_PACKET,
+    'hit': HIT_PACKET,
+    'Stand': STAND_PACKET,
+    'stand': STAND_PACKET,
+}
+
+
 def pack_client_payload(decision: str) -> bytes:
     """
     Create a client payload packet with Hit or Stand decision.
@@ -174,20 +210,15 @@ def pack_client_payload(decision: str) -> bytes:
     Returns:
         bytes: 10-byte client payload packet
     """
-    # Convert to protocol format: "Hittt" or "Stand"
-    if decision.lower().startswith('h'):
-        decision_bytes = b'Hittt'
-    else:
-        decision_bytes = b'Stand'
+    packet = DECISION_PACKETS.get(decision)
+    if packet is not None:
+        return packet
     
-    return struct.pack(
-        '>Ib',
-        MAGIC_COOKIE,
-        MSG_TYPE_PAYLOAD
-    ) + decision_bytes
+    # Any other spelling: anything starting with 'h' is a hit
+    return HIT_PACKET if decision.lower().startswith('h') else STAND_PACKET
 
 
-def unpack_client_payload(data: bytes) -> str:
+def unpack_client_payload(data: bytes) -> Optional[str]:
     """
     Parse a client payload packet.
     
@@ -200,18 +231,13 @@ def unpack_client_payload(data: bytes) -> str:
     if len(data) < CLIENT_PAYLOAD_SIZE:
         return None
     
-    if not validate_magic_cookie(data):
-        return None
-    
-    msg_type = struct.unpack('>b', data[4:5])[0]
-    if msg_type != MSG_TYPE_PAYLOAD:
+    cookie, msg_type, decision = CLIENT_PAYLOAD_STRUCT.unpack_from(data)
+    if cookie != MAGIC_COOKIE or msg_type != MSG_TYPE_PAYLOAD:
         return None
     
-    decision = data[5:10].decode('utf-8', errors='replace')
-    
-    if decision == 'Hittt':
+    if decision == b'Hittt':
         return 'Hit'
-    elif decision == 'Stand':
+    elif decision == b'Stand':
         return 'Stand'
     else:
         return None
@@ -222,6 +248,15 @@ def unpack_client_payload(data: bytes) -> str:
 # Format: Magic(4) + Type(1) + Result(1) + Rank(2) + Suit(1) = 9 bytes
 # =============================================================================
 
+# Precompiled layout: Magic(I) + Type(b) + Result(B) + Rank(2s) + Suit(B)
+SERVER_PAYLOAD_STRUCT = struct.Struct('>IbB2sB')
+
+# Rank field for every rank a server sends (0 on result-only packets, 1-13
+# for cards), so the common case is a table lookup instead of text formatting
+RANK_FIELDS = tuple(f'{rank:02d}'.encode('utf-8') for rank in range(14))
+RANKS_BY_FIELD = {field: rank for rank, field in enumerate(RANK_FIELDS)}
+
+
 def pack_server_payload(result: int, rank: int, suit: int) -> bytes:
     """
     Create a server payload packet with game result and card.
@@ -235,17 +270,21 @@ def pack_server_payload(result: int, rank: int, suit: int) -> bytes:
         bytes: 9-byte server payload packet
     """
     # Rank is encoded as 2 bytes (01-13 as text-like encoding)
-    rank_bytes = f'{rank:02d}'.encode('utf-8')
+    if 0 <= rank < len(RANK_FIELDS):
+        rank_bytes = RANK_FIELDS[rank]
+    else:
+        rank_bytes = f'{rank:02d}'.encode('utf-8')
     
-    return struct.pack(
-        '>IbB',
+    return SERVER_PAYLOAD_STRUCT.pack(
         MAGIC_COOKIE,
         MSG_TYPE_PAYLOAD,
-        result
-    ) + rank_bytes + struct.pack('>B', suit)
+        result,
+        rank_bytes,
+        suit
+    )
 
 
-def unpack_server_payload(data: bytes) -> tuple:
+def unpack_server_payload(data: bytes) -> Optional[Tuple[int, int, int]]:
     """
     Parse a server payload packet.
     
@@ -255,25 +294,36 @@ def unpack_server_payload(data: bytes) -> tuple:
     Returns:
         tuple: (result, rank, suit) or None if invalid
     """
-    if len(data) < SERVER_PAYLOAD_SIZE:
-        return None
-    
-    if not validate_magic_cookie(data):
-        return None
+    return unpack_server_payload_from(data)
+
+
+def unpack_server_payload_from(buffer, offset: int = 0) -> Optional[Tuple[int, int, int]]:
+    """
+    Parse a server payload packet directly from a buffer.
+    Works on bytes, bytearray or memoryview without slicing a copy out.
     
-    msg_type = struct.unpack('>b', data[4:5])[0]
-    if msg_type != MSG_TYPE_PAYLOAD:
+    Args:
+        buffer: Buffer holding the packet
+        offset: Position of the packet within the buffer
+        
+    Returns:
+        tuple: (result, rank, suit) or None if invalid
+    """
+    if len(buffer) - offset < SERVER_PAYLOAD_SIZE:
         return None
     
-    result = struct.unpack('>B', data[5:6])[0]
-    
-    # Rank is 2 bytes as text (e.g., "01", "13")
-    try:
-        rank = int(data[6:8].decode('utf-8'))
-    except ValueError:
+    cookie, msg_type, result, rank_bytes, suit = SERVER_PAYLOAD_STRUCT.unpack_from(buffer, offset)
+    if cookie != MAGIC_COOKIE or msg_type != MSG_TYPE_PAYLOAD:
         return None
     
-    suit = struct.unpack('>B', data[8:9])[0]
+    # Rank is 2 bytes as text (e.g., "01", "13"); anything outside the
+    # table is parsed the slow way
+    rank = RANKS_BY_FIELD.get(rank_bytes)
+    if rank is None:
+        try:
+            rank = int(rank_bytes)
+        except ValueError:
+            return None
     
     return (result, rank, suit)
 
@@ -292,8 +342,10 @@ def get_message_type(data: bytes) -> int:
     Returns:
         int: Message type, or -1 if invalid
     """
-    if len(data) < 5:
+    if len(data) < 5 or data[:4] != COOKIE_BYTES:
         return -1
-    if not validate_magic_cookie(data):
-        return -1
-    return struct.unpack('>b', data[4:5])[0]
+    
+    # The type is one signed byte, so it is read by index; every MSG_TYPE_*
+    # is positive and only stray bytes need the sign applied
+    msg_type = data[4]
+    return msg_type - 256 if msg_type > 127 else msg_type
@@ -3,16 +3,21 @@ Blackjack Server Application.
 Broadcasts offers via UDP and handles game sessions via TCP.
 """
 
+import random
+import selectors
 import socket
 import threading
-import time
 import sys
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from typing import Optional
 
 from config import (
-    UDP_BROADCAST_PORT, BROADCAST_INTERVAL, SERVER_NAME,
+    UDP_BROADCAST_PORT, BROADCAST_INTERVAL, SERVER_NAME, UDP_SOCKET_BUFFER_SIZE,
+    USE_MULTICAST, MULTICAST_GROUP, MULTICAST_TTL,
     RESULT_ONGOING, RESULT_WIN, RESULT_LOSS, RESULT_TIE,
-    SOCKET_TIMEOUT
+    SOCKET_TIMEOUT, CLIENT_THREAD_STACK_SIZE, LISTEN_BACKLOG, MAX_CONCURRENT_CLIENTS,
+    SHOW_ROUND_DETAILS
 )
 from protocol import (
     pack_offer, pack_server_payload, unpack_request, unpack_client_payload
@@ -20,7 +25,7 @@ from protocol import (
 from game_logic import Deck, Card, calculate_hand_value, card_value
 from utils import (
     log_info, log_success, log_warning, log_error,
-    display_server_started, display_welcome, colored, Colors
+    display_server_started, display_welcome, colored, Colors, set_socket_buffer
 )
 
 
@@ -30,6 +35,38 @@ from utils import (
 
 running = True  # Global flag to stop all threads
 
+# Sockets of accepted clients whose session hasn't ended, so shutdown can
+# disconnect them instead of waiting for their games to finish
+client_sockets = set()
+client_sockets_lock = threading.Lock()
+
+
+# =============================================================================
+# PAYLOAD TABLE
+# =============================================================================
+
+# Every payload the server can send, packed once: each result code with each
+# card, plus the (result, 0, 0) packets that end a round
+SERVER_PAYLOADS = {
+    (result, rank, suit): pack_server_payload(result, rank, suit)
+    for result in (RESULT_ONGOING, RESULT_TIE, RESULT_LOSS, RESULT_WIN)
+    for rank in range(14)
+    for suit in range(4)
+}
+
+
+# =============================================================================
+# ROUND LOG TEXT
+# =============================================================================
+
+# Colored text is built once at import instead of for every round
+ROUND_SEPARATOR = colored('=' * 50, Colors.DIM)
+PLAYER_BUSTED_MSG = f"  {colored('Player BUSTED!', Colors.RED)}"
+DEALER_BUSTED_MSG = f"  {colored('Dealer BUSTED! Player wins!', Colors.GREEN)}"
+DEALER_WINS_MSG = f"  {colored('Dealer wins!', Colors.RED)}"
+PLAYER_WINS_MSG = f"  {colored('Player wins!', Colors.GREEN)}"
+TIE_MSG = f"  {colored('Tie!', Colors.YELLOW)}"
+
 
 # =============================================================================
 # HELPER FUNCTIONS
@@ -48,41 +85,86 @@ def get_local_ip() -> str:
         return "127.0.0.1"
 
 
+def flush_payloads(client_socket: socket.socket, pending: bytearray):
+    """
+    Send every queued payload with a single call and empty the queue.
+    
+    Args:
+        client_socket: The client's TCP socket
+        pending: Packed payloads waiting to be sent, back to back
+    """
+    if pending:
+        # sendall reads the buffer in place and retries short writes
+        client_socket.sendall(pending)
+        pending.clear()
+
+
+def flush_round_log(round_log: list):
+    """
+    Print every queued round log line with a single print and empty the queue.
+    
+    Args:
+        round_log: Lines waiting to be printed, in order
+    """
+    if round_log:
+        print("\n".join(round_log))
+        round_log.clear()
+
+
 # =============================================================================
 # UDP BROADCASTER
 # =============================================================================
 
-def udp_broadcaster(tcp_port: int):
+def open_broadcast_socket() -> socket.socket:
     """
-    Broadcast offer messages via UDP every BROADCAST_INTERVAL seconds.
+    Create the UDP socket offers are sent from, aimed at the offer port.
     
-    Args:
-        tcp_port: The TCP port clients should connect to
+    Returns:
+        socket.socket: Configured UDP socket
     """
-    global running
-    
     # Create UDP socket for broadcasting
     udp_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
     udp_socket.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
     udp_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    send_buffer = set_socket_buffer(udp_socket, socket.SO_SNDBUF, UDP_SOCKET_BUFFER_SIZE)
+    if send_buffer < UDP_SOCKET_BUFFER_SIZE:
+        log_info(f"UDP send buffer is {send_buffer // 1024} KiB "
+                 f"(raise net.core.wmem_max for more)")
     
-    # Create the offer packet
-    offer_packet = pack_offer(tcp_port, SERVER_NAME)
+    if USE_MULTICAST:
+        # Only hosts that joined the group get the offers; loopback lets a
+        # client on this machine see them too
+        udp_socket.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_TTL, MULTICAST_TTL)
+        udp_socket.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_LOOP, 1)
+        destination = (MULTICAST_GROUP, UDP_BROADCAST_PORT)
+    else:
+        destination = ('<broadcast>', UDP_BROADCAST_PORT)
     
     log_info(f"UDP broadcaster started on port {UDP_BROADCAST_PORT}")
     
-    while running:
-        try:
-            # Broadcast to all addresses on the network
-            udp_socket.sendto(offer_packet, ('<broadcast>', UDP_BROADCAST_PORT))
-            time.sleep(BROADCAST_INTERVAL)
-        except Exception as e:
-            if running:
-                log_warning(f"Broadcast error: {e}")
-            time.sleep(BROADCAST_INTERVAL)
+    try:
+        # Fix the destination once, so each broadcast is a plain send with no
+        # address to resolve
+        udp_socket.connect(destination)
+    except OSError as e:
+        log_warning(f"Broadcast error: {e}")
+    
+    return udp_socket
+
+
+def broadcast_offer(udp_socket: socket.socket, offer_packet: bytes):
+    """
+    Send one offer to every client on the network.
     
-    udp_socket.close()
-    log_info("UDP broadcaster stopped")
+    Args:
+        udp_socket: Socket from open_broadcast_socket()
+        offer_packet: Packed offer message
+    """
+    try:
+        udp_socket.send(offer_packet)
+    except Exception as e:
+        if running:
+            log_warning(f"Broadcast error: {e}")
 
 
 # =============================================================================
@@ -102,18 +184,26 @@ def handle_client(client_socket: socket.socket, client_address: tuple):
     
     try:
         client_socket.settimeout(SOCKET_TIMEOUT)
+        # Each burst of cards is already a single write (see flush_payloads),
+        # so send it immediately instead of letting Nagle hold it back
+        client_socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        
+        # One receive buffer for the whole session; packets are parsed
+        # straight out of it through a view instead of a new bytes per recv
+        recv_buffer = bytearray(1024)
+        recv_view = memoryview(recv_buffer)
         
         # =====================================================================
         # RECEIVE REQUEST
         # =====================================================================
         
         # Receive the request message
-        data = client_socket.recv(1024)
-        if not data:
+        nbytes = client_socket.recv_into(recv_buffer)
+        if not nbytes:
             log_warning(f"Client {client_ip} disconnected before sending request")
             return
         
-        request = unpack_request(data)
+        request = unpack_request(recv_view[:nbytes])
         if request is None:
             log_error(f"Invalid request from {client_ip}")
             return
@@ -121,17 +211,33 @@ def handle_client(client_socket: socket.socket, client_address: tuple):
         num_rounds, client_name = request
         log_success(f"Client '{client_name}' wants to play {num_rounds} rounds")
         
+        # Payloads are queued and only sent when the server is about to wait
+        # for the client (or the session ends), so a burst of cards goes out
+        # in one write instead of one send per card. They are appended to a
+        # single buffer, so there is nothing to join when it is sent.
+        pending = bytearray()
+        
+        # Round log lines are collected the same way and printed in one go
+        # whenever the payloads are flushed, so the console is written a
+        # couple of times per round instead of once per line
+        round_log = []
+        
+        # One deck per session, refilled at the start of every round and
+        # dealt from the session's own generator (seeded from the OS)
+        deck = Deck(random.Random())
+        
         # =====================================================================
         # GAME LOOP
         # =====================================================================
         
         for round_num in range(1, num_rounds + 1):
-            print(f"\n{colored('='*50, Colors.DIM)}")
-            print(f"  Round {round_num}/{num_rounds} vs {client_name}")
-            print(f"{colored('='*50, Colors.DIM)}")
+            if SHOW_ROUND_DETAILS:
+                round_log.append(f"\n{ROUND_SEPARATOR}")
+                round_log.append(f"  Round {round_num}/{num_rounds} vs {client_name}")
+                round_log.append(ROUND_SEPARATOR)
             
-            # Create fresh deck for this round
-            deck = Deck()
+            # Full deck for this round
+            deck.reset()
             
             # Deal initial cards
             player_cards = [deck.deal(), deck.deal()]
@@ -139,17 +245,16 @@ def handle_client(client_socket: socket.socket, client_address: tuple):
             
             player_total = calculate_hand_value(player_cards)
             
-            print(f"  Dealt to player: {player_cards[0]} {player_cards[1]} (Total: {player_total})")
-            print(f"  Dealer has: {dealer_cards[0]} [hidden]")
+            if SHOW_ROUND_DETAILS:
+                round_log.append(f"  Dealt to player: {player_cards[0]} {player_cards[1]} (Total: {player_total})")
+                round_log.append(f"  Dealer has: {dealer_cards[0]} [hidden]")
             
             # Send player's 2 cards
             for card in player_cards:
-                payload = pack_server_payload(RESULT_ONGOING, card.rank, card.suit)
-                client_socket.send(payload)
+                pending += SERVER_PAYLOADS[RESULT_ONGOING, card.rank, card.suit]
             
             # Send dealer's visible card (first card)
-            payload = pack_server_payload(RESULT_ONGOING, dealer_cards[0].rank, dealer_cards[0].suit)
-            client_socket.send(payload)
+            pending += SERVER_PAYLOADS[RESULT_ONGOING, dealer_cards[0].rank, dealer_cards[0].suit]
             
             # -----------------------------------------------------------------
             # PLAYER'S TURN
@@ -159,21 +264,24 @@ def handle_client(client_socket: socket.socket, client_address: tuple):
             
             while True:
                 # Wait for player decision
+                flush_payloads(client_socket, pending)
+                flush_round_log(round_log)
                 try:
-                    data = client_socket.recv(1024)
-                    if not data:
+                    nbytes = client_socket.recv_into(recv_buffer)
+                    if not nbytes:
                         log_warning(f"Client {client_ip} disconnected mid-game")
                         return
                 except socket.timeout:
                     log_warning(f"Client {client_ip} timed out")
                     return
                 
-                decision = unpack_client_payload(data)
+                decision = unpack_client_payload(recv_view[:nbytes])
                 if decision is None:
                     log_error(f"Invalid payload from {client_ip}")
                     continue
                 
-                print(f"  Player chose: {decision}")
+                if SHOW_ROUND_DETAILS:
+                    round_log.append(f"  Player chose: {decision}")
                 
                 if decision == "Stand":
                     break
@@ -181,22 +289,22 @@ def handle_client(client_socket: socket.socket, client_address: tuple):
                 # Player hits - deal a new card
                 new_card = deck.deal()
                 player_cards.append(new_card)
-                player_total = calculate_hand_value(player_cards)
+                player_total += new_card.value()  # Running total, no re-sum
                 
-                print(f"  Dealt: {new_card} (New total: {player_total})")
+                if SHOW_ROUND_DETAILS:
+                    round_log.append(f"  Dealt: {new_card} (New total: {player_total})")
                 
                 # Check for bust
                 if player_total > 21:
                     # Player busted - send card with loss result
-                    payload = pack_server_payload(RESULT_LOSS, new_card.rank, new_card.suit)
-                    client_socket.send(payload)
-                    print(f"  {colored('Player BUSTED!', Colors.RED)}")
+                    pending += SERVER_PAYLOADS[RESULT_LOSS, new_card.rank, new_card.suit]
+                    if SHOW_ROUND_DETAILS:
+                        round_log.append(PLAYER_BUSTED_MSG)
                     player_busted = True
                     break
                 else:
                     # Send the new card
-                    payload = pack_server_payload(RESULT_ONGOING, new_card.rank, new_card.suit)
-                    client_socket.send(payload)
+                    pending += SERVER_PAYLOADS[RESULT_ONGOING, new_card.rank, new_card.suit]
             
             # -----------------------------------------------------------------
             # DEALER'S TURN (if player didn't bust)
@@ -204,45 +312,52 @@ def handle_client(client_socket: socket.socket, client_address: tuple):
             
             if not player_busted:
                 # Reveal hidden card
-                print(f"  Dealer reveals: {dealer_cards[1]}")
-                payload = pack_server_payload(RESULT_ONGOING, dealer_cards[1].rank, dealer_cards[1].suit)
-                client_socket.send(payload)
+                if SHOW_ROUND_DETAILS:
+                    round_log.append(f"  Dealer reveals: {dealer_cards[1]}")
+                pending += SERVER_PAYLOADS[RESULT_ONGOING, dealer_cards[1].rank, dealer_cards[1].suit]
                 
                 dealer_total = calculate_hand_value(dealer_cards)
-                print(f"  Dealer total: {dealer_total}")
+                if SHOW_ROUND_DETAILS:
+                    round_log.append(f"  Dealer total: {dealer_total}")
                 
                 # Dealer hits until 17 or more
                 while dealer_total < 17:
                     new_card = deck.deal()
                     dealer_cards.append(new_card)
-                    dealer_total = calculate_hand_value(dealer_cards)
+                    dealer_total += new_card.value()
                     
-                    print(f"  Dealer draws: {new_card} (Total: {dealer_total})")
+                    if SHOW_ROUND_DETAILS:
+                        round_log.append(f"  Dealer draws: {new_card} (Total: {dealer_total})")
                     
                     # Send dealer's new card
-                    payload = pack_server_payload(RESULT_ONGOING, new_card.rank, new_card.suit)
-                    client_socket.send(payload)
+                    pending += SERVER_PAYLOADS[RESULT_ONGOING, new_card.rank, new_card.suit]
                 
                 # -----------------------------------------------------------------
                 # DETERMINE WINNER
                 # -----------------------------------------------------------------
                 
                 if dealer_total > 21:
-                    print(f"  {colored('Dealer BUSTED! Player wins!', Colors.GREEN)}")
                     result = RESULT_WIN
+                    outcome = DEALER_BUSTED_MSG
                 elif dealer_total > player_total:
-                    print(f"  {colored('Dealer wins!', Colors.RED)} ({dealer_total} > {player_total})")
                     result = RESULT_LOSS
+                    outcome = f"{DEALER_WINS_MSG} ({dealer_total} > {player_total})"
                 elif player_total > dealer_total:
-                    print(f"  {colored('Player wins!', Colors.GREEN)} ({player_total} > {dealer_total})")
                     result = RESULT_WIN
+                    outcome = f"{PLAYER_WINS_MSG} ({player_total} > {dealer_total})"
                 else:
-                    print(f"  {colored('Tie!', Colors.YELLOW)} ({player_total} = {dealer_total})")
                     result = RESULT_TIE
+                    outcome = f"{TIE_MSG} ({player_total} = {dealer_total})"
+                
+                if SHOW_ROUND_DETAILS:
+                    round_log.append(outcome)
                 
                 # Send final result with a dummy card (0,0)
-                payload = pack_server_payload(result, 0, 0)
-                client_socket.send(payload)
+                pending += SERVER_PAYLOADS[result, 0, 0]
+            
+            flush_round_log(round_log)
+        
+        flush_payloads(client_socket, pending)
         
         # =====================================================================
         # SESSION COMPLETE
@@ -257,6 +372,8 @@ def handle_client(client_socket: socket.socket, client_address: tuple):
     except Exception as e:
         log_error(f"Error handling client {client_ip}: {e}")
     finally:
+        with client_sockets_lock:
+            client_sockets.discard(client_socket)
         client_socket.close()
         log_info(f"Connection with {client_ip} closed")
 
@@ -265,9 +382,25 @@ def handle_client(client_socket: socket.socket, client_address: tuple):
 # TCP SERVER
 # =============================================================================
 
+def close_if_cancelled(client_socket: socket.socket, future: Future):
+    """
+    Close the socket of a session dropped from the queue before it started.
+    Sessions that did start close their own socket in handle_client.
+    
+    Args:
+        client_socket: The accepted client socket
+        future: The finished handle_client call for that socket
+    """
+    if future.cancelled():
+        with client_sockets_lock:
+            client_sockets.discard(client_socket)
+        client_socket.close()
+
+
 def tcp_server(port: int):
     """
-    Main TCP server that accepts client connections.
+    Main TCP server: accepts client connections and broadcasts offers for
+    them every BROADCAST_INTERVAL seconds, both from this one thread.
     
     Args:
         port: The TCP port to listen on
@@ -276,34 +409,85 @@ def tcp_server(port: int):
     
     server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
     server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-    server_socket.settimeout(1.0)  # Allow checking 'running' flag
+    udp_socket = None
+    executor = None
     
     try:
         server_socket.bind(('', port))
-        server_socket.listen(5)
+        server_socket.listen(LISTEN_BACKLOG)
+        # Only accepted after the selector reports a pending connection
+        server_socket.setblocking(False)
         
         log_info(f"TCP server listening on port {port}")
         
-        while running:
-            try:
-                client_socket, client_address = server_socket.accept()
-                # Handle each client in a new thread
-                client_thread = threading.Thread(
-                    target=handle_client,
-                    args=(client_socket, client_address),
-                    daemon=True
+        # Applies to threads started from here on, i.e. the client handlers,
+        # so many idle sessions don't each reserve a full default stack
+        try:
+            threading.stack_size(CLIENT_THREAD_STACK_SIZE)
+        except (ValueError, RuntimeError):
+            pass  # Size not supported on this platform; keep the default
+        
+        # A fixed pool of handler threads, started on demand and reused, so a
+        # burst of connections can't create an unbounded number of threads
+        executor = ThreadPoolExecutor(
+            max_workers=MAX_CONCURRENT_CLIENTS,
+            thread_name_prefix="client"
+        )
+        
+        udp_socket = open_broadcast_socket()
+        offer_packet = pack_offer(port, SERVER_NAME)
+        
+        with selectors.DefaultSelector() as selector:
+            selector.register(server_socket, selectors.EVENT_READ)
+            
+            # Sleep in the selector until a client connects or the next offer
+            # is due, so an idle server wakes once per broadcast interval
+            next_offer = time.monotonic()
+            while running:
+                now = time.monotonic()
+                if now >= next_offer:
+                    broadcast_offer(udp_socket, offer_packet)
+                    next_offer = now + BROADCAST_INTERVAL
+                
+                if not selector.select(next_offer - now):
+                    continue  # Time for the next offer
+                
+                try:
+                    client_socket, client_address = server_socket.accept()
+                except BlockingIOError:
+                    continue  # Connection went away before we accepted it
+                except Exception as e:
+                    if running:
+                        log_error(f"Accept error: {e}")
+                    continue
+                
+                # Handle each client on a pool thread (queued if all are busy)
+                with client_sockets_lock:
+                    client_sockets.add(client_socket)
+                future = executor.submit(handle_client, client_socket, client_address)
+                future.add_done_callback(
+                    lambda done, sock=client_socket: close_if_cancelled(sock, done)
                 )
-                client_thread.start()
-            except socket.timeout:
-                continue
-            except Exception as e:
-                if running:
-                    log_error(f"Accept error: {e}")
     
     except Exception as e:
         log_error(f"Server error: {e}")
     finally:
         server_socket.close()
+        if executor is not None:
+            # Drop queued sessions and end running ones: pool threads are
+            # joined at exit, so games in progress would otherwise hold the
+            # process open. Cancelled sessions close their sockets through
+            # close_if_cancelled, so only running ones are left to shut down
+            executor.shutdown(wait=False, cancel_futures=True)
+            with client_sockets_lock:
+                for client_socket in client_sockets:
+                    try:
+                        client_socket.shutdown(socket.SHUT_RDWR)
+                    except OSError:
+                        pass  # Already disconnected
+        if udp_socket is not None:
+            udp_socket.close()
+            log_info("UDP broadcaster stopped")
         log_info("TCP server stopped")
 
 
@@ -330,21 +514,13 @@ def main():
     print(display_server_started(local_ip, tcp_port, SERVER_NAME))
     print()
     
-    # Start UDP broadcaster in background thread
-    broadcaster_thread = threading.Thread(
-        target=udp_broadcaster,
-        args=(tcp_port,),
-        daemon=True
-    )
-    broadcaster_thread.start()
-    
-    # Start TCP server in main thread (with keyboard interrupt handling)
+    # Serve clients and broadcast offers from the main thread (with keyboard
+    # interrupt handling)
     try:
         tcp_server(tcp_port)
     except KeyboardInterrupt:
         print(f"\n{colored('Shutting down server...', Colors.YELLOW)}")
         running = False
-        time.sleep(1)
         print(colored("Server stopped. Goodbye!", Colors.GREEN))
 
 
@@ -3,9 +3,15 @@ Utility functions for display and logging in the Blackjack application.
 Provides colorful console output and formatting helpers.
 """
 
+import re
 import sys
-from typing import List, Tuple
-from config import RESULT_WIN, RESULT_LOSS, RESULT_TIE, RESULT_ONGOING
+import unicodedata
+from functools import lru_cache
+from typing import TYPE_CHECKING, List, Tuple
+from config import RESULT_WIN, RESULT_LOSS, RESULT_TIE, RESULT_ONGOING, RANK_NAMES, SUIT_SYMBOLS
+
+if TYPE_CHECKING:
+    import socket
 
 
 # =============================================================================
@@ -59,8 +65,6 @@ def format_card_colored(rank: int, suit: int) -> str:
     Returns:
         str: Colored card string
     """
-    from config import RANK_NAMES, SUIT_SYMBOLS
-    
     card_str = f"{RANK_NAMES[rank]}{SUIT_SYMBOLS[suit]}"
     
     if suit <= 1:  # Hearts and Diamonds are red
@@ -69,6 +73,13 @@ def format_card_colored(rank: int, suit: int) -> str:
         return colored(card_str, Colors.WHITE)
 
 
+# Colored string for every (rank, suit), so hands are rendered by lookup
+CARD_STRINGS_COLORED = {
+    (rank, suit): format_card_colored(rank, suit)
+    for rank in RANK_NAMES for suit in SUIT_SYMBOLS
+}
+
+
 # =============================================================================
 # BOX DRAWING
 # =============================================================================
@@ -116,11 +127,13 @@ def draw_box(lines: List[str], width: int = 60, title: str = None) -> str:
     return '\n'.join(result)
 
 
+# Any ANSI escape sequence (colors, styles, cursor movement)
+ANSI_ESCAPE_RE = re.compile(r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])')
+
+
 def strip_ansi(text: str) -> str:
     """Remove ANSI color codes from text."""
-    import re
-    ansi_escape = re.compile(r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])')
-    return ansi_escape.sub('', text)
+    return ANSI_ESCAPE_RE.sub('', text)
 
 
 def get_visible_width(text: str) -> int:
@@ -128,20 +141,23 @@ def get_visible_width(text: str) -> int:
     Get the visible width of text in terminal columns.
     Accounts for ANSI codes (0 width) and emojis (2 width).
     """
-    import unicodedata
-    
     # First strip ANSI codes
     clean = strip_ansi(text)
     
-    width = 0
+    # Every character is at least one column; plain ASCII is exactly one,
+    # so only the other characters need a Unicode lookup
+    width = len(clean)
+    if clean.isascii():
+        return width
+    
     for char in clean:
+        if char < '\x80':
+            continue
         # Check East Asian Width property
         ea_width = unicodedata.east_asian_width(char)
         if ea_width in ('F', 'W'):  # Fullwidth or Wide (includes most emojis)
-            width += 2
+            width += 1
         elif unicodedata.category(char) == 'So':  # Symbol, Other (catches more emojis)
-            width += 2
-        else:
             width += 1
     
     return width
@@ -205,6 +221,27 @@ def display_game_state(player_cards: str, player_total: int,
     return draw_box(lines, width=65, title="🎰 BLACKJACK")
 
 
+def display_game_state_minimal(player_cards: str, player_total: int,
+                               dealer_cards: str) -> str:
+    """
+    Display the current game state without the odds calculator.
+    Used in no-statistics mode, where there is nothing else to show.
+    
+    Args:
+        player_cards: Formatted player cards string
+        player_total: Player's hand total
+        dealer_cards: Formatted dealer cards string (with hidden card marker)
+        
+    Returns:
+        str: Formatted game state display
+    """
+    lines = [
+        f"Your hand: {player_cards}  (Total: {bold(str(player_total))})",
+        f"Dealer shows: {dealer_cards}"
+    ]
+    return draw_box(lines, width=65, title="🎰 BLACKJACK")
+
+
 def display_result(result: int, player_total: int, dealer_total: int,
                    wins: int, losses: int, ties: int, show_stats: bool = True) -> str:
     """
@@ -248,6 +285,9 @@ def display_result(result: int, player_total: int, dealer_total: int,
     return draw_box(lines, width=50, title="ROUND RESULT")
 
 
+# These banners only depend on their arguments, so each is rendered once
+# per process and the same string is returned on later calls
+@lru_cache(maxsize=None)
 def display_welcome() -> str:
     """Display welcome banner."""
     banner = """
@@ -262,6 +302,7 @@ def display_welcome() -> str:
     return colored(banner, Colors.CYAN)
 
 
+@lru_cache(maxsize=None)
 def display_leaderboard_intro() -> str:
     """Display a fun introduction to the leaderboard system."""
     
@@ -311,6 +352,7 @@ def display_leaderboard_intro() -> str:
     return trophy + "\n".join(lines)
 
 
+@lru_cache(maxsize=None)
 def display_server_started(ip: str, tcp_port: int, server_name: str) -> str:
     """Display server started message."""
     lines = [
@@ -324,6 +366,7 @@ def display_server_started(ip: str, tcp_port: int, server_name: str) -> str:
     return draw_box(lines, width=50, title="🎰 SERVER STARTED")
 
 
+@lru_cache(maxsize=None)
 def display_client_started(client_name: str) -> str:
     """Display client started message."""
     lines = [
@@ -334,6 +377,46 @@ def display_client_started(client_name: str) -> str:
     return draw_box(lines, width=50, title="🎴 CLIENT STARTED")
 
 
+# =============================================================================
+# SOCKETS
+# =============================================================================
+
+# socket is imported inside these helpers: they are only called by code that
+# already has a socket open, and the menu shouldn't load it just for them
+
+def join_multicast_group(sock: "socket.socket", group: str):
+    """
+    Subscribe a bound UDP socket to a multicast group on every interface.
+    
+    Args:
+        sock: Bound UDP socket
+        group: Multicast group address
+    """
+    import socket
+    membership = socket.inet_aton(group) + socket.inet_aton("0.0.0.0")
+    sock.setsockopt(socket.IPPROTO_IP, socket.IP_ADD_MEMBERSHIP, membership)
+
+
+def set_socket_buffer(sock: "socket.socket", option: int, size: int) -> int:
+    """
+    Ask the kernel for a socket buffer size.
+    
+    Args:
+        sock: Socket to configure
+        option: socket.SO_RCVBUF or socket.SO_SNDBUF
+        size: Requested size in bytes
+        
+    Returns:
+        int: Size actually granted, which the OS may cap (0 if unsupported)
+    """
+    import socket
+    try:
+        sock.setsockopt(socket.SOL_SOCKET, option, size)
+        return sock.getsockopt(socket.SOL_SOCKET, option)
+    except OSError:
+        return 0
+
+
 # =============================================================================
 # LOGGING
 # =============================================================================